@@ -6,8 +6,13 @@ from __future__ import annotations
 import argparse
 import sys
 from pathlib import Path
+from typing import Callable
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 
 DEFAULT_INPUT = Path(
     "/Users/markjaysonfarol13/Higher Ed research/IPEDS/Paneled Datasets/Crosswalks/enrollment_crosswalk_template.csv"
@@ -35,6 +40,40 @@ EF_HEAD_FTFT_UG_RES_FOREIGN = "EF_HEAD_FTFT_UG_RES_FOREIGN"
 EF_HEAD_FTFT_UG_RES_UNKNOWN = "EF_HEAD_FTFT_UG_RES_UNKNOWN"
 
 
+def arrow_mask(result: pa.Array | pa.ChunkedArray, index: pd.Index) -> pd.Series:
+    """Wrap a null-free Arrow boolean result as a pandas mask aligned to ``index``."""
+    return pd.Series(result.to_numpy(zero_copy_only=False), index=index, dtype=bool)
+
+
+def category_mask(series: pd.Series, predicate: Callable[[pa.Array], pa.Array]) -> pd.Series:
+    """Evaluate ``predicate`` once per category of ``series`` and broadcast it through the codes."""
+    categories = pa.array(series.cat.categories, type=pa.string())
+    # Trailing False catches the -1 code pandas uses for missing values.
+    per_category = np.append(predicate(categories).to_numpy(zero_copy_only=False), False)
+    return pd.Series(per_category[series.cat.codes.to_numpy()], index=series.index, dtype=bool)
+
+
+def blank_mask_of(series: pd.Series) -> pd.Series:
+    """True where ``series`` is missing or only whitespace."""
+    text = series.astype("string")
+    return (text.isna() | text.str.strip().eq("")).fillna(True).astype(bool)
+
+
+def write_csv(df: pd.DataFrame, dest: Path) -> None:
+    """Write ``df`` with Arrow's CSV writer; nulls become empty fields as with ``to_csv``."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # The writer has no dictionary support, so categorical columns go out as plain strings.
+    table = table.cast(
+        pa.schema(
+            [
+                field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+                for field in table.schema
+            ]
+        )
+    )
+    pacsv.write_csv(table, str(dest), write_options=pacsv.WriteOptions(include_header=True, quoting_style="needed"))
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--input", type=Path, default=DEFAULT_INPUT)
@@ -68,8 +107,9 @@ def main() -> None:
         raise RuntimeError(f"Crosswalk template missing required columns: {missing}")
 
     cw["concept_key"] = cw["concept_key"]
-    cw["source_var"] = cw["source_var"].astype(str).str.strip()
-    cw["survey"] = cw["survey"].astype(str).str.strip().str.upper()
+    # Few distinct surveys/variables repeat across many rows, so compare on category codes.
+    cw["source_var"] = cw["source_var"].astype(str).str.strip().astype("category")
+    cw["survey"] = cw["survey"].astype(str).str.strip().str.upper().astype("category")
     if "label_norm" in cw.columns:
         cw["label_norm"] = cw["label_norm"].astype(str).str.strip()
     else:
@@ -87,11 +127,28 @@ def main() -> None:
         print(cw.loc[dup_mask, key_cols + ["concept_key"]].head(10).to_string(index=False))
         raise SystemExit(1)
 
-    def is_blank(x: object) -> bool:
-        return pd.isna(x) or str(x).strip() == ""
+    # survey/source_var/label_norm are fixed while the rules run, so their predicates
+    # are evaluated once with Arrow kernels and shared across rules.
+    label_arr = pa.array(cw["label_norm"], type=pa.string())
+    is_e12 = category_mask(cw["survey"], lambda c: pc.equal(c, "12MONTHENROLLMENT"))
+    is_ef = category_mask(cw["survey"], lambda c: pc.equal(c, "FALLENROLLMENT"))
+    label_masks: dict[str, pd.Series] = {}
+
+    def label_has(text: str) -> pd.Series:
+        if text not in label_masks:
+            label_masks[text] = arrow_mask(pc.match_substring(label_arr, text, ignore_case=True), cw.index)
+        return label_masks[text]
+
+    def source_in(values: list[str]) -> pd.Series:
+        value_set = pa.array(values, type=pa.string())
+        return category_mask(cw["source_var"], lambda c: pc.is_in(c, value_set=value_set))
+
+    def source_upper_in(values: list[str]) -> pd.Series:
+        value_set = pa.array(values, type=pa.string())
+        return category_mask(cw["source_var"], lambda c: pc.is_in(pc.utf8_upper(c), value_set=value_set))
 
     def fresh_blank_mask() -> pd.Series:
-        return cw["concept_key"].map(is_blank)
+        return blank_mask_of(cw["concept_key"])
 
     concepts = [
         E12_HEAD_ALL_TOT_ALL,
@@ -114,249 +171,243 @@ def main() -> None:
     ]
     fill_counts: dict[str, int] = {key: 0 for key in concepts}
 
-    def _note_is_blank(series: pd.Series) -> pd.Series:
-        return series.map(is_blank)
-
     # E12 graduate FTE (estimated or reported)
     blank_mask = fresh_blank_mask()
     mask_e12_gr_fte = (
-        (cw["survey"] == "12MONTHENROLLMENT")
+        is_e12
         & (
-            cw["label_norm"].str.contains("estimated full-time equivalent fte graduate enrollment", case=False, na=False)
-            | cw["label_norm"]
-            .str.contains("reported full-time equivalent fte graduate enrollment", case=False, na=False)
+            label_has("estimated full-time equivalent fte graduate enrollment")
+            | label_has("reported full-time equivalent fte graduate enrollment")
         )
         & blank_mask
     )
     if mask_e12_gr_fte.any():
         cw.loc[mask_e12_gr_fte, "concept_key"] = E12_HEAD_GR_FT_ALL
-        cw.loc[mask_e12_gr_fte & _note_is_blank(cw["note"]), "note"] = f"auto:{E12_HEAD_GR_FT_ALL}"
+        cw.loc[mask_e12_gr_fte & blank_mask_of(cw["note"]), "note"] = f"auto:{E12_HEAD_GR_FT_ALL}"
     fill_counts[E12_HEAD_GR_FT_ALL] = int(mask_e12_gr_fte.sum())
 
     # Rule A: 12-month unduplicated totals
     blank_mask = fresh_blank_mask()
     mask_e12_total = (
-        (cw["survey"] == "12MONTHENROLLMENT")
-        & cw["source_var"].isin(["FYRACE24", "EFYTOTLT"])
+        is_e12
+        & source_in(["FYRACE24", "EFYTOTLT"])
         & blank_mask
     )
     cw.loc[mask_e12_total, "concept_key"] = E12_HEAD_ALL_TOT_ALL
-    cw.loc[mask_e12_total & _note_is_blank(cw["note"]), "note"] = f"auto:{E12_HEAD_ALL_TOT_ALL}"
+    cw.loc[mask_e12_total & blank_mask_of(cw["note"]), "note"] = f"auto:{E12_HEAD_ALL_TOT_ALL}"
     fill_counts[E12_HEAD_ALL_TOT_ALL] = int(mask_e12_total.sum())
 
     # E12 undergraduate total (only if clearly labeled)
     blank_mask = fresh_blank_mask()
     mask_e12_ug_label = (
-        (cw["survey"] == "12MONTHENROLLMENT")
-        & cw["label_norm"].str.contains("undergraduate", case=False, na=False)
-        & cw["label_norm"].str.contains("total", case=False, na=False)
+        is_e12
+        & label_has("undergraduate")
+        & label_has("total")
         & blank_mask
     )
     if mask_e12_ug_label.any():
         cw.loc[mask_e12_ug_label, "concept_key"] = E12_HEAD_UG_TOT_ALL
-        cw.loc[mask_e12_ug_label & _note_is_blank(cw["note"]), "note"] = f"auto:{E12_HEAD_UG_TOT_ALL}"
+        cw.loc[mask_e12_ug_label & blank_mask_of(cw["note"]), "note"] = f"auto:{E12_HEAD_UG_TOT_ALL}"
     fill_counts[E12_HEAD_UG_TOT_ALL] = int(mask_e12_ug_label.sum())
 
     # EF undergraduate deg/cert-seeking FTFT total
     blank_mask = fresh_blank_mask()
     mask_ef_ug_degseek_ftft = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["label_norm"].str.contains(
-            "full-time first-time degree/certificate-seeking undergraduate", case=False, na=False
-        )
+        is_ef
+        & label_has("full-time first-time degree/certificate-seeking undergraduate")
         & blank_mask
     )
     if mask_ef_ug_degseek_ftft.any():
         cw.loc[mask_ef_ug_degseek_ftft, "concept_key"] = EF_HEAD_UG_DEGSEEK_FTFT_TOT
-        cw.loc[mask_ef_ug_degseek_ftft & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_UG_DEGSEEK_FTFT_TOT}"
+        cw.loc[mask_ef_ug_degseek_ftft & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_UG_DEGSEEK_FTFT_TOT}"
     fill_counts[EF_HEAD_UG_DEGSEEK_FTFT_TOT] = int(mask_ef_ug_degseek_ftft.sum())
 
     # EF FTFT deg/cert-seeking total when label omits "full-time"
     blank_mask = fresh_blank_mask()
     mask_ef_ftft_ug_degseek = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["label_norm"].str.contains("first-time degree/certificate-seeking undergraduate students", case=False, na=False)
+        is_ef
+        & label_has("first-time degree/certificate-seeking undergraduate students")
         & blank_mask
     )
     if mask_ef_ftft_ug_degseek.any():
         cw.loc[mask_ef_ftft_ug_degseek, "concept_key"] = EF_HEAD_FTFT_UG_DEGSEEK_TOT
-        cw.loc[mask_ef_ftft_ug_degseek & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_DEGSEEK_TOT}"
+        cw.loc[mask_ef_ftft_ug_degseek & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_DEGSEEK_TOT}"
     fill_counts[EF_HEAD_FTFT_UG_DEGSEEK_TOT] = int(mask_ef_ftft_ug_degseek.sum())
 
     # EF undergraduate deg/cert-seeking total (any load)
     blank_mask = fresh_blank_mask()
     mask_ef_ug_degseek_label = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["label_norm"].str.contains("degree/certificate-seeking", case=False, na=False)
-        & cw["label_norm"].str.contains("undergraduate", case=False, na=False)
+        is_ef
+        & label_has("degree/certificate-seeking")
+        & label_has("undergraduate")
         & blank_mask
     )
     if mask_ef_ug_degseek_label.any():
         cw.loc[mask_ef_ug_degseek_label, "concept_key"] = EF_HEAD_UG_DEGSEEK_TOT
-        cw.loc[mask_ef_ug_degseek_label & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_UG_DEGSEEK_TOT}"
+        cw.loc[mask_ef_ug_degseek_label & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_UG_DEGSEEK_TOT}"
     fill_counts[EF_HEAD_UG_DEGSEEK_TOT] = int(mask_ef_ug_degseek_label.sum())
 
     # EF undergraduate entering total
     blank_mask = fresh_blank_mask()
     mask_ef_ug_total_entering = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["label_norm"].str.contains("total entering students at the undergraduate level", case=False, na=False)
+        is_ef
+        & label_has("total entering students at the undergraduate level")
         & blank_mask
     )
     if mask_ef_ug_total_entering.any():
         cw.loc[mask_ef_ug_total_entering, "concept_key"] = EF_HEAD_UG_TOT_ALL
-        cw.loc[mask_ef_ug_total_entering & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_UG_TOT_ALL}"
+        cw.loc[mask_ef_ug_total_entering & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_UG_TOT_ALL}"
     fill_counts[EF_HEAD_UG_TOT_ALL] = int(mask_ef_ug_total_entering.sum())
 
     # EF graduate entering total
     blank_mask = fresh_blank_mask()
     mask_ef_gr_total_entering = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["label_norm"].str.contains("total entering students at the graduate level", case=False, na=False)
+        is_ef
+        & label_has("total entering students at the graduate level")
         & blank_mask
     )
     if mask_ef_gr_total_entering.any():
         cw.loc[mask_ef_gr_total_entering, "concept_key"] = EF_HEAD_GR_TOT_ALL
-        cw.loc[mask_ef_gr_total_entering & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_GR_TOT_ALL}"
+        cw.loc[mask_ef_gr_total_entering & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_GR_TOT_ALL}"
     fill_counts[EF_HEAD_GR_TOT_ALL] = int(mask_ef_gr_total_entering.sum())
 
     # Rule B: Fall grand totals (EFRACE24/EFTOTLT)
     blank_mask = fresh_blank_mask()
     mask_ef_total_old = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & (cw["source_var"] == "EFRACE24")
+        is_ef
+        & source_in(["EFRACE24"])
         & cw["year_start"].between(2004, 2007, inclusive="both")
         & blank_mask
     )
     mask_ef_total_new = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & (cw["source_var"] == "EFTOTLT")
+        is_ef
+        & source_in(["EFTOTLT"])
         & (cw["year_start"] >= 2008)
         & blank_mask
     )
     mask_ef_total = mask_ef_total_old | mask_ef_total_new
     if mask_ef_total.any():
         cw.loc[mask_ef_total, "concept_key"] = EF_HEAD_ALL_TOT_ALL
-        cw.loc[mask_ef_total & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_ALL_TOT_ALL}"
+        cw.loc[mask_ef_total & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_ALL_TOT_ALL}"
     fill_counts[EF_HEAD_ALL_TOT_ALL] = int(mask_ef_total.sum())
 
     # Rule D: Full-time undergraduates
     blank_mask = fresh_blank_mask()
     mask_ft_ug_name = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["source_var"].str.upper().eq("EFUGFT")
+        is_ef
+        & source_upper_in(["EFUGFT"])
         & blank_mask
     )
     mask_ft_ug_label = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["label_norm"].str.contains("full-time", case=False, na=False)
-        & cw["label_norm"].str.contains("undergraduate", case=False, na=False)
+        is_ef
+        & label_has("full-time")
+        & label_has("undergraduate")
         & (
-            cw["label_norm"].str.contains("enrollment", case=False, na=False)
-            | cw["label_norm"].str.contains("students", case=False, na=False)
+            label_has("enrollment")
+            | label_has("students")
         )
         & blank_mask
     )
     mask_ft_ug = mask_ft_ug_name | mask_ft_ug_label
     if mask_ft_ug.any():
         cw.loc[mask_ft_ug, "concept_key"] = EF_HEAD_FT_UG_TOT_ALL
-        cw.loc[mask_ft_ug & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_FT_UG_TOT_ALL}"
+        cw.loc[mask_ft_ug & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_FT_UG_TOT_ALL}"
     fill_counts[EF_HEAD_FT_UG_TOT_ALL] = int(mask_ft_ug.sum())
 
     # Rule E: Full-time graduate
     blank_mask = fresh_blank_mask()
     grad_ft_varnames = {"EFGRFT"}
     mask_ft_gr_name = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["source_var"].str.upper().isin(grad_ft_varnames)
+        is_ef
+        & source_upper_in(sorted(grad_ft_varnames))
         & blank_mask
     )
     mask_ft_gr_label = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["label_norm"].str.contains("full-time", case=False, na=False)
-        & cw["label_norm"].str.contains("graduate", case=False, na=False)
+        is_ef
+        & label_has("full-time")
+        & label_has("graduate")
         & (
-            cw["label_norm"].str.contains("enrollment", case=False, na=False)
-            | cw["label_norm"].str.contains("students", case=False, na=False)
+            label_has("enrollment")
+            | label_has("students")
         )
         & blank_mask
     )
     mask_ft_gr = mask_ft_gr_name | mask_ft_gr_label
     if mask_ft_gr.any():
         cw.loc[mask_ft_gr, "concept_key"] = EF_HEAD_FT_GR_TOT_ALL
-        cw.loc[mask_ft_gr & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_FT_GR_TOT_ALL}"
+        cw.loc[mask_ft_gr & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_FT_GR_TOT_ALL}"
     fill_counts[EF_HEAD_FT_GR_TOT_ALL] = int(mask_ft_gr.sum())
 
     # Rule F: Full-time all levels
     blank_mask = fresh_blank_mask()
     mask_ft_all_label = (
-        (cw["survey"] == "FALLENROLLMENT")
-        & cw["label_norm"].str.contains("full-time", case=False, na=False)
+        is_ef
+        & label_has("full-time")
         & (
-            cw["label_norm"].str.contains("enrollment", case=False, na=False)
-            | cw["label_norm"].str.contains("students", case=False, na=False)
+            label_has("enrollment")
+            | label_has("students")
         )
-        & ~cw["label_norm"].str.contains("undergraduate", case=False, na=False)
-        & ~cw["label_norm"].str.contains("graduate", case=False, na=False)
+        & ~label_has("undergraduate")
+        & ~label_has("graduate")
         & blank_mask
     )
     if mask_ft_all_label.any():
         cw.loc[mask_ft_all_label, "concept_key"] = EF_HEAD_FT_ALL_TOT_ALL
-        cw.loc[mask_ft_all_label & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_FT_ALL_TOT_ALL}"
+        cw.loc[mask_ft_all_label & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_FT_ALL_TOT_ALL}"
     fill_counts[EF_HEAD_FT_ALL_TOT_ALL] = int(mask_ft_all_label.sum())
 
     # Rule G: FTFT residence buckets
     blank_mask = fresh_blank_mask()
     base_ftft_ug = (
-        (cw["survey"] == "FALLENROLLMENT")
+        is_ef
         & (
-            cw["label_norm"].str.contains("first-time", case=False, na=False)
-            | cw["label_norm"].str.contains("first time", case=False, na=False)
+            label_has("first-time")
+            | label_has("first time")
         )
         & (
-            cw["label_norm"].str.contains("degree/certificate", case=False, na=False)
-            | cw["label_norm"].str.contains("degree-seeking", case=False, na=False)
-            | cw["label_norm"].str.contains("degree or certificate", case=False, na=False)
-            | cw["label_norm"].str.contains("degree", case=False, na=False)
+            label_has("degree/certificate")
+            | label_has("degree-seeking")
+            | label_has("degree or certificate")
+            | label_has("degree")
         )
-        & cw["label_norm"].str.contains("undergraduate", case=False, na=False)
+        & label_has("undergraduate")
         & blank_mask
     )
     mask_res_instate = (
         base_ftft_ug
         & (
-            cw["label_norm"].str.contains("in same state", case=False, na=False)
-            | cw["label_norm"].str.contains("in same jurisdiction", case=False, na=False)
+            label_has("in same state")
+            | label_has("in same jurisdiction")
         )
     )
     mask_res_outstate = (
         base_ftft_ug
         & (
-            cw["label_norm"].str.contains("in a different state", case=False, na=False)
-            | cw["label_norm"].str.contains("in a different jurisdiction", case=False, na=False)
+            label_has("in a different state")
+            | label_has("in a different jurisdiction")
         )
     )
     mask_res_foreign = (
         base_ftft_ug
         & (
-            cw["label_norm"].str.contains("outside the united states", case=False, na=False)
-            | cw["label_norm"].str.contains("outside the us", case=False, na=False)
+            label_has("outside the united states")
+            | label_has("outside the us")
         )
     )
-    mask_res_unknown = base_ftft_ug & cw["label_norm"].str.contains("unknown", case=False, na=False)
+    mask_res_unknown = base_ftft_ug & label_has("unknown")
 
     if mask_res_instate.any():
         cw.loc[mask_res_instate, "concept_key"] = EF_HEAD_FTFT_UG_RES_INSTATE
-        cw.loc[mask_res_instate & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_RES_INSTATE}"
+        cw.loc[mask_res_instate & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_RES_INSTATE}"
     if mask_res_outstate.any():
         cw.loc[mask_res_outstate, "concept_key"] = EF_HEAD_FTFT_UG_RES_OUTSTATE
-        cw.loc[mask_res_outstate & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_RES_OUTSTATE}"
+        cw.loc[mask_res_outstate & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_RES_OUTSTATE}"
     if mask_res_foreign.any():
         cw.loc[mask_res_foreign, "concept_key"] = EF_HEAD_FTFT_UG_RES_FOREIGN
-        cw.loc[mask_res_foreign & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_RES_FOREIGN}"
+        cw.loc[mask_res_foreign & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_RES_FOREIGN}"
     if mask_res_unknown.any():
         cw.loc[mask_res_unknown, "concept_key"] = EF_HEAD_FTFT_UG_RES_UNKNOWN
-        cw.loc[mask_res_unknown & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_RES_UNKNOWN}"
+        cw.loc[mask_res_unknown & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_HEAD_FTFT_UG_RES_UNKNOWN}"
     fill_counts[EF_HEAD_FTFT_UG_RES_INSTATE] = int(mask_res_instate.sum())
     fill_counts[EF_HEAD_FTFT_UG_RES_OUTSTATE] = int(mask_res_outstate.sum())
     fill_counts[EF_HEAD_FTFT_UG_RES_FOREIGN] = int(mask_res_foreign.sum())
@@ -365,16 +416,16 @@ def main() -> None:
     # Student-faculty ratio (scalar)
     blank_mask = fresh_blank_mask()
     mask_stud_fac_ratio = (
-        (cw["survey"] == "FALLENROLLMENT")
+        is_ef
         & (
-            cw["label_norm"].str.contains("student-to-faculty ratio", case=False, na=False)
-            | cw["label_norm"].str.contains("student-faculty ratio", case=False, na=False)
+            label_has("student-to-faculty ratio")
+            | label_has("student-faculty ratio")
         )
         & blank_mask
     )
     if mask_stud_fac_ratio.any():
         cw.loc[mask_stud_fac_ratio, "concept_key"] = EF_STUD_FAC_RATIO
-        cw.loc[mask_stud_fac_ratio & _note_is_blank(cw["note"]), "note"] = f"auto:{EF_STUD_FAC_RATIO}"
+        cw.loc[mask_stud_fac_ratio & blank_mask_of(cw["note"]), "note"] = f"auto:{EF_STUD_FAC_RATIO}"
     fill_counts[EF_STUD_FAC_RATIO] = int(mask_stud_fac_ratio.sum())
 
     ck_series = cw["concept_key"].astype(str).str.strip()
@@ -390,7 +441,7 @@ def main() -> None:
         )
 
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    cw.to_csv(args.output, index=False)
+    write_csv(cw, args.output)
     num_nonblank = len(cw) - num_missing
     print(f"Wrote autofilled crosswalk to {args.output} ({num_nonblank} of {len(cw)} rows have non-blank concept_key)")
     print("Autofill rule counts:")
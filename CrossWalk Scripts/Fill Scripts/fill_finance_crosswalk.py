@@ -12,6 +12,7 @@ This is a first-pass mapping into the conceptual schema:
 You MUST review the output (finance_crosswalk_filled.csv) before using it in production.
 """
 
+from functools import lru_cache
 from pathlib import Path
 import re
 
@@ -679,6 +680,8 @@ def _build_var_type_map(dict_path: Path | str | None = None) -> dict[tuple[str,
     return mapping
 
 
+# Templates repeat the same (label, form family, source var) across many year ranges.
+@lru_cache(maxsize=None)
 def assign_concept(label: str, form_family: str, base_key: str, source_var: str | None = None) -> str | None:
     """Heuristic mapping from source_label_norm to the conceptual schema."""
     source = (source_var or "").strip().upper()
@@ -1460,15 +1463,15 @@ def main() -> None:
         else pd.Series(True, index=cw.index)
     )
     mask_to_fill = mask_blank & amount_mask
-    cw.loc[mask_to_fill, "concept_key"] = cw.loc[mask_to_fill].apply(
-        lambda r: assign_concept(
-            r.get("source_label_norm"),
-            r.get("form_family"),
-            r.get("base_key"),
-            r.get("source_var"),
-        ),
-        axis=1,
+    to_fill = cw.loc[mask_to_fill]
+    # Walk the four input columns in lockstep instead of building a row Series per call.
+    concept_args = zip(
+        *(
+            to_fill[col].tolist() if col in to_fill.columns else [None] * len(to_fill)
+            for col in ("source_label_norm", "form_family", "base_key", "source_var")
+        )
     )
+    cw.loc[mask_to_fill, "concept_key"] = [assign_concept(*args) for args in concept_args]
 
     cw["weight"] = pd.to_numeric(cw["weight"], errors="coerce").fillna(1.0)
 
@@ -18,6 +18,17 @@ DEFAULT_YEARS = "2004-2024"
 DEFAULT_OUTPUT = Path(
     "/Users/markjaysonfarol13/Higher Ed research/IPEDS/Paneled Datasets/Crosswalks/enrollment_crosswalk_template.csv"
 )
+LAKE_COLUMNS = [
+    "year",
+    "survey",
+    "survey_hint",
+    "subsurvey",
+    "source_var",
+    "source_label",
+    "label_norm",
+    "table_name",
+    "data_filename",
+]
 
 
 def parse_years(expr: str) -> List[int]:
@@ -46,10 +57,11 @@ def parse_years(expr: str) -> List[int]:
     return sorted(years)
 
 
-def load_lake(path: Path) -> pd.DataFrame:
+def load_lake(path: Path, years: Iterable[int]) -> pd.DataFrame:
+    """Read only the template's columns, keeping rows whose year is in ``years``."""
     if not path.exists():
         raise FileNotFoundError(f"Dictionary lake not found: {path}")
-    return pd.read_parquet(path)
+    return pd.read_parquet(path, columns=LAKE_COLUMNS, filters=[("year", "in", list(years))])
 
 
 def select_enrollment_vars(lake: pd.DataFrame, years: Iterable[int]) -> pd.DataFrame:
@@ -101,7 +113,7 @@ def main() -> None:
     if not years:
         raise SystemExit("No valid years parsed from --years argument.")
 
-    lake = load_lake(args.dictionary)
+    lake = load_lake(args.dictionary, years)
     lake_enroll = select_enrollment_vars(lake, years)
 
     template = pd.DataFrame(
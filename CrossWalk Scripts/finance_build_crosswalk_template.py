@@ -14,6 +14,18 @@ DEFAULT_DICT_LAKE = Path(
 DEFAULT_OUTPUT = Path(
     "/Users/markjaysonfarol13/Higher Ed research/IPEDS/Paneled Datasets/Crosswalks/finance_crosswalk_template.csv"
 )
+LAKE_COLUMNS = [
+    "year",
+    "survey",
+    "form_family",
+    "section",
+    "line_code",
+    "base_key",
+    "source_var",
+    "source_label",
+    "source_label_norm",
+    "is_finance",
+]
 
 
 def parse_args() -> argparse.Namespace:
@@ -28,12 +40,17 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    df = pd.read_parquet(args.dict_lake)
+    # Read only the columns used below and let pyarrow drop rows outside the year range.
+    # Every LAKE_COLUMNS entry is required by the dictionary ingest, so none needs a fallback.
+    df = pd.read_parquet(
+        args.dict_lake,
+        columns=LAKE_COLUMNS,
+        filters=[("year", ">=", args.year_min), ("year", "<=", args.year_max)],
+    )
     mask = (
-        df.get("is_finance", False)
-        & df.get("form_family").notna()
-        & df.get("base_key").notna()
-        & df.get("year").between(args.year_min, args.year_max)
+        df["is_finance"].fillna(False).astype(bool)
+        & df["form_family"].notna()
+        & df["base_key"].notna()
     )
     subset = df.loc[mask, [
         "year",
@@ -44,20 +44,32 @@ using this script.
 import argparse
 import csv
 import hashlib
+import json
 import os
 import re
+import shutil
+import tempfile
+import threading
 import time
 import zipfile
-from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
-from functools import partial
+from email.utils import formatdate
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import IO, Iterable, Iterator
 from urllib.parse import urljoin, urlparse
 
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
 from urllib3.util.retry import Retry
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.etree
+except ImportError:  # lxml is optional; BeautifulSoup's html.parser is the fallback
+    lxml = None
 
 DOWNLOAD_DIR = '/Users/markjaysonfarol13/Higher Ed research/IPEDS/Cross sectional Datas'
 YEARS_TO_DOWNLOAD = range(2004, 2025)
@@ -67,9 +79,16 @@ USER_AGENT = (
     'AppleWebKit/537.36 (KHTML, like Gecko) '
     'Chrome/123.0.0.0 Safari/537.36'
 )
-HEADERS = {'User-Agent': USER_AGENT}
+HEADERS = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'}
 MAX_WORKERS = int(os.getenv('IPEDSDL_WORKERS', '3'))
+# Concurrent file downloads across all years, and the overall request start rate they share.
+DOWNLOAD_WORKERS = int(os.getenv('IPEDSDL_DOWNLOAD_WORKERS', '6'))
+REQUESTS_PER_SECOND = float(os.getenv('IPEDSDL_RPS', '4'))
 DOWNLOAD_ACCESS_DATABASE = False
+# The BeautifulSoup fallback only builds <tr> subtrees; page chrome, scripts and styles are skipped.
+TABLE_ROWS_ONLY = SoupStrainer('tr')
+# One <tr> of a year page: (row_idx, row_text_lower, [(link_text_lower, href), ...]).
+PageRow = tuple[int, str, list[tuple[str, str]]]
 DICT_EXTENSION_PRIORITY = {
     '.zip': 3,
     '.xlsx': 2,
@@ -98,7 +117,50 @@ SURVEY_DEFINITIONS: dict[str, list[str]] = {
 # Matches the uniquely named 12-Month Enrollment files (e.g., EFFY2004_RV.csv).
 EFFY_SPECIAL_PATTERN = re.compile(r'EFFY[-_]?(\d{4})', re.IGNORECASE)
 FINANCE_FORM_PATTERN = re.compile(r'(?:^|[_-])(F[123][A-Z0-9]+)')
-HUMAN_RESOURCES_S_PATTERN = re.compile(r'(?:^|[_-])S(?:19|20)\d{2}')
+
+
+class RateLimiter:
+    """Space request starts at least ``1 / rate`` seconds apart across all threads."""
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+# Parsed DataFiles.aspx link tables are reused from <year>/_links.json for this long.
+LINKS_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+# Written next to each completed download as "<filename>.done" holding "size,sha256".
+DONE_SUFFIX = '.done'
+# Column order of <year>_manifest.csv.
+MANIFEST_FIELDS = (
+    'year',
+    'survey',
+    'prefix',
+    'filename',
+    'url',
+    'is_revision',
+    'has_dictionary',
+    'dictionary_filename',
+    'release',
+    'filesize_bytes',
+    'sha256',
+)
+# Response bodies are copied from the socket to disk (or buffer) in blocks of this size.
+DOWNLOAD_BLOCK_BYTES = 1024 * 1024
+# Zip downloads are buffered in memory up to this size, then spooled to a temporary file.
+ZIP_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+# Shared by every year's session so the politeness budget is global, not per year.
+DOWNLOAD_RATE_LIMITER = RateLimiter(REQUESTS_PER_SECOND)
 
 
 def ensure_directory(path: str) -> None:
@@ -119,10 +181,21 @@ def compute_file_metadata(path: str) -> tuple[str, str]:
     return str(size), sha256.hexdigest()
 
 
+def compute_buffer_metadata(buffer: IO[bytes]) -> tuple[str, str]:
+    """Return (filesize_bytes, sha256) for a download held in a (possibly spooled) buffer."""
+    sha256 = hashlib.sha256()
+    size = 0
+    buffer.seek(0)
+    for chunk in iter(lambda: buffer.read(1 << 20), b""):
+        size += len(chunk)
+        sha256.update(chunk)
+    return str(size), sha256.hexdigest()
+
+
 def fetch_remote_filesize(session: requests.Session, url: str) -> str:
     """Attempt to retrieve the Content-Length without downloading the file."""
     try:
-        response = session.head(url, allow_redirects=True, timeout=30, headers=HEADERS)
+        response = session.head(url, allow_redirects=True, timeout=30)
         response.raise_for_status()
     except requests.RequestException:
         return ""
@@ -132,9 +205,7 @@ def fetch_remote_filesize(session: requests.Session, url: str) -> str:
     return ""
 
 
-def get_survey_prefixes_for_year(
-    survey_name: str, survey_prefixes: list[str], year: int
-) -> list[str]:
+def get_survey_prefixes(survey_name: str, survey_prefixes: list[str]) -> list[str]:
     """Return canonical filename prefixes for the survey.
 
     Filenames on the IPEDS site historically begin with a short survey code
@@ -160,38 +231,29 @@ def get_survey_prefixes_for_year(
     return sorted(prefixes, key=len, reverse=True)
 
 
-def build_prefix_pattern(prefix: str) -> re.Pattern[str]:
-    """Return a regex that matches the prefix at token boundaries."""
+def prefix_token_pattern(prefix: str) -> str:
+    """Return a regex for the prefix token itself; callers anchor it at a token boundary."""
     prefix_core = prefix.rstrip('_-') or prefix
-    boundary = r'(?:^|[_-])'
     if prefix_core == 'C':
         trailing = r'(?=\d{4})'
     else:
         trailing = r'(?=[A-Z0-9])'
-    return re.compile(rf'{boundary}{re.escape(prefix_core)}{trailing}')
+    return f'{re.escape(prefix_core)}{trailing}'
 
 
-def fetch_year_page(session: requests.Session, year: int) -> BeautifulSoup | None:
-    """Retrieve and parse the HTML page listing files for a given year."""
-    url = urljoin(BASE_URL, f'DataFiles.aspx?year={year}')
-    try:
-        response = session.get(url, timeout=60, headers=HEADERS)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        print(f"ERROR: Unable to fetch file list for {year}: {exc}")
-        return None
-    return BeautifulSoup(response.text, 'html.parser')
-
-
-def parse_year_links(
-    soup: BeautifulSoup, year: int
-) -> tuple[dict[str, dict[str, dict[str, list[dict]]]], list[dict]]:
-    """Parse the year's HTML and choose the data/dictionary links plus Access DB."""
-    found_link = False
+def build_survey_matcher() -> tuple[re.Pattern[str], dict[str, tuple[int, str, str]]]:
+    """Compile every survey prefix into one alternation scanned once per filename.
 
+    The pattern is a zero-width probe at each token boundary (start of name, or after ``_``/``-``)
+    whose alternatives are ordered longest prefix first (ties keep SURVEY_DEFINITIONS order), so
+    each ``finditer`` hit names the best prefix at that boundary.  Groups map to
+    ``(rank, survey_name, base_prefix)``; the lowest rank over all hits is the prefix the original
+    longest-first loop would have picked.  The HR ``S`` branch additionally requires a
+    ``S19xx``/``S20xx`` year so bare ``S`` tokens in other names do not claim the file.
+    """
     prefix_map: dict[str, tuple[str, str]] = {}
     for survey_name, survey_prefixes in SURVEY_DEFINITIONS.items():
-        for prefix in get_survey_prefixes_for_year(survey_name, survey_prefixes, year):
+        for prefix in get_survey_prefixes(survey_name, survey_prefixes):
             base_prefix = prefix.rstrip('_-') or prefix
             prefix_map[prefix] = (survey_name, base_prefix)
 
@@ -201,63 +263,233 @@ def parse_year_links(
     # file (e.g., S2004).
     prefixes.sort(key=len, reverse=True)
 
-    prefix_patterns: dict[str, re.Pattern[str]] = {
-        prefix: build_prefix_pattern(prefix) for prefix in prefixes
-    }
-
-    def refine_matched_prefix(
-        survey_name: str, filename_upper: str, base_prefix: str
-    ) -> str:
-        """Return a sub-prefix token when available (e.g., F1A vs F2A)."""
-        if survey_name == 'Finance':
-            form_match = FINANCE_FORM_PATTERN.search(filename_upper)
-            if form_match:
-                return form_match.group(1)
-        return base_prefix
-
-    def is_valid_generic_prefix(
-        survey_name: str, base_prefix: str, filename_upper: str
-    ) -> bool:
-        """Filter overly broad prefixes such as 'S' and 'C'."""
+    branches: list[str] = []
+    groups: dict[str, tuple[int, str, str]] = {}
+    seen_patterns: set[str] = set()
+    for prefix in prefixes:
+        pattern = prefix_token_pattern(prefix)
+        # 'S', 'S_' and 'S-' compile to the same pattern; only the first can ever win.
+        if pattern in seen_patterns:
+            continue
+        seen_patterns.add(pattern)
+        survey_name, base_prefix = prefix_map[prefix]
         if survey_name == 'HumanResources' and base_prefix == 'S':
-            return bool(HUMAN_RESOURCES_S_PATTERN.search(filename_upper))
-        return True
+            pattern += r'(?=(?:19|20)\d{2})'
+        group = f'p{len(groups)}'
+        groups[group] = (len(groups), survey_name, base_prefix)
+        branches.append(f'(?P<{group}>{pattern})')
+    return re.compile(r'(?:^|(?<=[_-]))(?=' + '|'.join(branches) + ')'), groups
 
-    def identify_survey(filename_upper: str) -> tuple[str, str] | None:
-        """Return the matching survey and refined prefix (if applicable)."""
-        for prefix in prefixes:
-            if prefix_patterns[prefix].search(filename_upper):
-                survey_name, base_prefix = prefix_map[prefix]
-                if not is_valid_generic_prefix(survey_name, base_prefix, filename_upper):
-                    continue
-                refined = refine_matched_prefix(survey_name, filename_upper, base_prefix)
-                return survey_name, refined
 
-        special_match = EFFY_SPECIAL_PATTERN.search(filename_upper)
-        if special_match and special_match.group(1) == str(year):
-            return '12MonthEnrollment', 'EFFY'
+# The prefix set is the same for every year, so the matcher is compiled once at import.
+SURVEY_MATCHER, SURVEY_MATCHER_GROUPS = build_survey_matcher()
+
+
+def refine_matched_prefix(survey_name: str, filename_upper: str, base_prefix: str) -> str:
+    """Return a sub-prefix token when available (e.g., F1A vs F2A)."""
+    if survey_name == 'Finance':
+        form_match = FINANCE_FORM_PATTERN.search(filename_upper)
+        if form_match:
+            return form_match.group(1)
+    return base_prefix
+
+
+# The same canonical filenames recur across rows and years, so results are memoized.
+@lru_cache(maxsize=8192)
+def identify_survey(filename_upper: str, year: int) -> tuple[str, str] | None:
+    """Return the matching survey and refined prefix (if applicable)."""
+    hits = [SURVEY_MATCHER_GROUPS[match.lastgroup] for match in SURVEY_MATCHER.finditer(filename_upper)]
+    if hits:
+        _, survey_name, base_prefix = min(hits)
+        refined = refine_matched_prefix(survey_name, filename_upper, base_prefix)
+        return survey_name, refined
+
+    # EFFY files only count for the year they are listed under.
+    special_match = EFFY_SPECIAL_PATTERN.search(filename_upper)
+    if special_match and special_match.group(1) == str(year):
+        return '12MonthEnrollment', 'EFFY'
+    return None
+
+
+def load_cached_links(
+    cache_path: str,
+) -> tuple[dict[str, dict[str, dict[str, list[dict]]]], list[dict], dict[str, str]] | None:
+    """Return a ``parse_year_links`` result saved by ``save_cached_links``, if any.
+
+    The third item holds the ETag / Last-Modified validators the year page was served with.
+    """
+    try:
+        with open(cache_path, encoding='utf-8') as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError):
         return None
+    survey_links = payload.get('survey_links', {})
+    access_entries = payload.get('access_entries', [])
+    # JSON has no tuples; priorities are compared and sorted as tuples downstream.
+    for prefix_groups in survey_links.values():
+        for entry_group in prefix_groups.values():
+            for entries in entry_group.values():
+                for entry in entries:
+                    entry['priority'] = tuple(entry['priority'])
+    for entry in access_entries:
+        entry['priority'] = tuple(entry['priority'])
+    return survey_links, access_entries, payload.get('validators', {})
+
+
+def links_cache_is_fresh(cache_path: str) -> bool:
+    """Return True if the cached link table is young enough to use without asking the server."""
+    try:
+        return time.time() - os.path.getmtime(cache_path) <= LINKS_CACHE_MAX_AGE_SECONDS
+    except OSError:
+        return False
 
-    survey_results: defaultdict[
-        str, defaultdict[str, dict[str, dict[str, dict]]]
-    ] = defaultdict(lambda: defaultdict(lambda: {'_best_data': {}, '_best_dict': {}}))
-    access_entries: list[dict] = []
 
+def save_cached_links(
+    cache_path: str,
+    survey_links: dict[str, dict[str, dict[str, list[dict]]]],
+    access_entries: list[dict],
+    validators: dict[str, str],
+) -> None:
+    """Persist a year's parsed link table (and its page validators) for incremental re-runs."""
+    payload = {'survey_links': survey_links, 'access_entries': access_entries, 'validators': validators}
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as fh:
+            json.dump(payload, fh)
+    except OSError as exc:
+        print(f"WARNING: Unable to cache links to {cache_path}: {exc}")
+
+
+def iter_page_rows(soup: BeautifulSoup) -> Iterator[PageRow]:
+    """Yield a PageRow for every ``<tr>`` of a BeautifulSoup tree.
+
+    Rows are numbered over all ``<tr>`` elements in document order, and each row lists every
+    ``<a href>`` beneath it (nested tables included).
+    """
     for row_idx, row in enumerate(soup.find_all('tr')):
-        row_text_lower = (row.get_text(separator=' ', strip=True) or '').lower()
-        for link in row.find_all('a', href=True):
-            found_link = True
-            row_id = f'row-{row_idx}'
-            link_text = (link.get_text() or '').strip().lower()
-            href = link['href']
+        links = [
+            ((link.get_text() or '').strip().lower(), link['href'])
+            for link in row.find_all('a', href=True)
+        ]
+        yield row_idx, (row.get_text(separator=' ', strip=True) or '').lower(), links
+
+
+if lxml is not None:
+    # Compiled once: row.xpath('...') would recompile the expression for every row. Plain
+    # (non-"smart") strings skip building a parent back-reference for each text node.
+    ROW_LINKS_XPATH = lxml.etree.XPath('.//a[@href]')
+    ROW_TEXT_XPATH = lxml.etree.XPath('.//text()[not(parent::script or parent::style)]', smart_strings=False)
+
+
+def _lxml_page_row(row_idx: int, row: 'lxml.etree._Element') -> PageRow:
+    links = [(''.join(link.itertext()).strip().lower(), link.get('href')) for link in ROW_LINKS_XPATH(row)]
+    if not links:
+        # Row text only matters for rows that carry links.
+        return row_idx, '', links
+    texts = (text.strip() for text in ROW_TEXT_XPATH(row))
+    return row_idx, ' '.join(text for text in texts if text).lower(), links
+
+
+def iter_streamed_rows(chunks: Iterable[bytes], encoding: str | None) -> Iterator[PageRow]:
+    """Stream-parse HTML chunks with lxml, yielding the same PageRows as ``iter_page_rows``.
+
+    Each outermost ``<tr>`` is turned into PageRows (its nested rows included, in document
+    order) as soon as it closes, then cleared along with the rows before it, so the page is
+    never held as a full DOM.
+    """
+    parser = lxml.etree.HTMLPullParser(events=('start', 'end'), tag='tr', encoding=encoding)
+    open_rows: dict['lxml.etree._Element', int] = {}
+    finished: list[PageRow] = []
+    next_idx = 0
+
+    def drain() -> Iterator[PageRow]:
+        nonlocal next_idx
+        for event, row in parser.read_events():
+            if event == 'start':
+                open_rows[row] = next_idx
+                next_idx += 1
+                continue
+            finished.append(_lxml_page_row(open_rows.pop(row), row))
+            if open_rows:
+                continue
+            # Nested rows close before their parent; restore document order.
+            finished.sort(key=lambda page_row: page_row[0])
+            yield from finished
+            finished.clear()
+            row.clear(keep_tail=True)
+            parent = row.getparent()
+            if parent is not None:
+                while row.getprevious() is not None:
+                    del parent[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def fetch_year_page(
+    session: requests.Session, year: int, *, extra_headers: dict[str, str] | None = None
+) -> tuple[list[PageRow] | None, dict[str, str]] | None:
+    """Retrieve the HTML page listing files for a given year and return its rows and validators.
+
+    With conditional ``extra_headers`` the rows are None when the server answers 304 Not
+    Modified.  Returns None if the page could not be fetched.
+    """
+    url = urljoin(BASE_URL, f'DataFiles.aspx?year={year}')
+    try:
+        with session.get(url, timeout=60, stream=True, headers=extra_headers) as response:
+            response.raise_for_status()
+            validators = response_validators(response)
+            if response.status_code == 304:
+                return None, validators
+            # Decode with the encoding response.text would have used.
+            if lxml is not None:
+                chunks = response.iter_content(chunk_size=65536)
+                return list(iter_streamed_rows(chunks, response.encoding)), validators
+            soup = BeautifulSoup(
+                response.content, 'html.parser', parse_only=TABLE_ROWS_ONLY, from_encoding=response.encoding
+            )
+    except requests.RequestException as exc:
+        print(f"ERROR: Unable to fetch file list for {year}: {exc}")
+        return None
+    rows = list(iter_page_rows(soup))
+    soup.decompose()
+    return rows, validators
+
+
+def parse_year_links(
+    rows: Iterable[PageRow], year: int
+) -> tuple[dict[str, dict[str, dict[str, list[dict]]]], list[dict]]:
+    """Choose the data/dictionary links plus Access DB from a year page's rows."""
+    found_link = False
+
+    # Best candidate per row, keyed flat by (survey, prefix, entry_type); insertion order of the
+    # keys doubles as the survey/prefix order of the result.
+    best_by_bucket: dict[tuple[str, str, str], dict[str, dict]] = {}
+    access_entries: list[dict] = []
+
+    for row_idx, row_text_lower, links in rows:
+        if not links:
+            continue
+        found_link = True
+        # Row-level facts are shared by every link in the row.
+        row_id = f'row-{row_idx}'
+        release = 'revised' if 'revised' in row_text_lower else ''
+        if not release and 'provisional' in row_text_lower:
+            release = 'provisional'
+        for link_text, href in links:
+            # Base URL directory boundaries mean a joined URL can only contain 'data/' when the
+            # href itself does, so most navigation links are dropped before any URL parsing.
+            if 'data/' not in href.lower():
+                continue
             full_url = urljoin(BASE_URL, href)
             if '/ipeds/datacenter/data/' not in full_url.lower():
                 continue
+            filename = os.path.basename(urlparse(full_url).path)
+            if not filename:
+                continue
             if 'access' in link_text and 'database' in link_text:
-                parsed = urlparse(full_url)
-                filename = os.path.basename(parsed.path)
-                if not filename:
-                    continue
                 is_revision = '_RV' in filename.upper()
                 ext = os.path.splitext(filename)[1].lower()
                 ext_priority = 1 if ext == '.zip' else 0
@@ -271,14 +503,10 @@ def parse_year_links(
                     }
                 )
                 continue
-            parsed = urlparse(full_url)
-            filename = os.path.basename(parsed.path)
-            if not filename:
-                continue
 
             filename_upper = filename.upper()
 
-            survey_match = identify_survey(filename_upper)
+            survey_match = identify_survey(filename_upper, year)
             if survey_match is None:
                 continue
 
@@ -299,48 +527,32 @@ def parse_year_links(
             else:
                 ext_priority = 1 if ext == '.zip' else 0
 
-            release = 'revised' if 'revised' in row_text_lower else ''
-            if not release and 'provisional' in row_text_lower:
-                release = 'provisional'
-
-            candidate = {
-                'priority': (revision_priority, ext_priority),
-                'url': full_url,
-                'filename': filename,
-                'is_revision': is_revision,
-                'row_id': row_id,
-                'release': release,
-            }
-
-            bucket = survey_results[survey][matched_prefix]
-            best_key = '_best_dict' if entry_type == 'dict' else '_best_data'
-            best_by_row = bucket[best_key]
+            priority = (revision_priority, ext_priority)
+            bucket_key = (survey, matched_prefix, entry_type)
+            best_by_row = best_by_bucket.get(bucket_key)
+            if best_by_row is None:
+                best_by_row = best_by_bucket[bucket_key] = {}
             existing = best_by_row.get(row_id)
-            if (existing is None) or (candidate['priority'] > existing['priority']):
-                best_by_row[row_id] = candidate
+            if (existing is None) or (priority > existing['priority']):
+                best_by_row[row_id] = {
+                    'priority': priority,
+                    'url': full_url,
+                    'filename': filename,
+                    'is_revision': is_revision,
+                    'row_id': row_id,
+                    'release': release,
+                }
 
     if not found_link:
         print(f"WARNING: No download links found for {year}.")
         return {}, []
 
     final_results: dict[str, dict[str, dict[str, list[dict]]]] = {}
-    for survey, prefix_map in survey_results.items():
-        final_results[survey] = {}
-        for prefix, entries in prefix_map.items():
-            data_candidates = sorted(
-                entries.get('_best_data', {}).values(),
-                key=lambda entry: entry['priority'],
-                reverse=True,
-            )
-            dict_candidates = sorted(
-                entries.get('_best_dict', {}).values(),
-                key=lambda entry: entry['priority'],
-                reverse=True,
-            )
-            final_results[survey][prefix] = {
-                'data': data_candidates,
-                'dict': dict_candidates,
-            }
+    for (survey, prefix, entry_type), best_by_row in best_by_bucket.items():
+        entry_group = final_results.setdefault(survey, {}).setdefault(prefix, {'data': [], 'dict': []})
+        entry_group[entry_type] = sorted(
+            best_by_row.values(), key=lambda entry: entry['priority'], reverse=True
+        )
 
     return final_results, access_entries
 
@@ -352,14 +564,25 @@ def download_file(
     *,
     max_attempts: int = 3,
     backoff_seconds: float = 1.0,
-) -> bool:
-    """Download a file from the provided URL to the destination path."""
+    buffer: IO[bytes] | None = None,
+    extra_headers: dict[str, str] | None = None,
+) -> requests.Response | None:
+    """Download a file from the provided URL to the destination path.
+
+    When ``buffer`` is given the body is written there instead and ``destination`` is
+    only used to name the file in checks and messages.  ``extra_headers`` (e.g. conditional
+    request validators) are sent on top of the session's own headers.  Returns the finished
+    response, whose status is 304 when a conditional request found the file unchanged, or None
+    on failure.
+    """
     attempt = 1
     delay = backoff_seconds
     while attempt <= max_attempts:
         try:
-            with session.get(url, stream=True, timeout=120, headers=HEADERS) as response:
+            with session.get(url, stream=True, timeout=120, headers=extra_headers) as response:
                 response.raise_for_status()
+                if response.status_code == 304:
+                    return response
                 content_type = (response.headers.get("Content-Type") or "").lower()
                 dest_ext = os.path.splitext(destination)[1].lower()
                 if "text/html" in content_type and dest_ext not in {".html", ".htm"}:
@@ -372,11 +595,18 @@ def download_file(
                         f"HTML directory page returned instead of file. URL: {url}\n"
                         f"{preview[:200].strip()}"
                     )
-                with open(destination, 'wb') as file_obj:
-                    for chunk in response.iter_content(chunk_size=65536):
-                        if chunk:
-                            file_obj.write(chunk)
-            return True
+                # Read urllib3's stream directly (still undoing any gzip/deflate coding) in large
+                # blocks rather than through iter_content's per-chunk generator.
+                response.raw.decode_content = True
+                if buffer is not None:
+                    # Start clean on retries so a partial earlier attempt is not kept.
+                    buffer.seek(0)
+                    buffer.truncate()
+                    shutil.copyfileobj(response.raw, buffer, DOWNLOAD_BLOCK_BYTES)
+                else:
+                    with open(destination, 'wb') as file_obj:
+                        shutil.copyfileobj(response.raw, file_obj, DOWNLOAD_BLOCK_BYTES)
+            return response
         except ValueError as exc:
             print(f"WARNING: {exc}")
         except requests.HTTPError as exc:
@@ -385,7 +615,8 @@ def download_file(
             if not retriable or attempt == max_attempts:
                 print(f"ERROR: Failed to download {url}: {exc}")
                 break
-        except requests.RequestException as exc:
+        except (requests.RequestException, Urllib3Error) as exc:
+            # Body reads from response.raw surface urllib3's errors unwrapped.
             if attempt == max_attempts:
                 print(f"ERROR: Failed to download {url}: {exc}")
                 break
@@ -398,18 +629,157 @@ def download_file(
         attempt += 1
         delay *= 2
 
-    return False
+    return None
 
 
-def unzip_and_remove(zip_path: str, extract_to: str, *, context: str = '') -> None:
-    """Extract a zip file to the target directory and delete the original archive."""
+def read_done_sentinel(sentinel: str) -> tuple[str, str, dict[str, str]] | None:
+    """Return (filesize_bytes, sha256, validators) from a ``.done`` sentinel, or None if absent.
+
+    The first line is ``size,sha256``; any further ``Header: value`` lines hold the ETag and
+    Last-Modified validators the server sent with the file.  Non-zip downloads are kept on disk,
+    so their sentinel only counts while the file itself still exists.
+    """
+    destination = sentinel[: -len(DONE_SUFFIX)]
+    if not destination.lower().endswith('.zip') and not os.path.exists(destination):
+        return None
+    try:
+        with open(sentinel, encoding='utf-8') as fh:
+            lines = fh.read().splitlines()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        return "", "", {}
+    file_size, _, file_hash = (lines[0] if lines else '').strip().partition(',')
+    validators: dict[str, str] = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if sep and value.strip():
+            validators[name.strip()] = value.strip()
+    return file_size, file_hash, validators
+
+
+def response_validators(response: requests.Response) -> dict[str, str]:
+    """Return the ETag / Last-Modified headers a later conditional request can send back."""
+    headers = response.headers
+    return {name: headers[name] for name in ('ETag', 'Last-Modified') if headers.get(name)}
+
+
+def listed_as_done(filename: str, year_files: set[str]) -> bool:
+    """Return True if a year-folder listing shows ``filename`` as completely downloaded.
+
+    Zips are extracted and discarded, so their sentinel suffices; other files must still exist.
+    """
+    if filename + DONE_SUFFIX not in year_files:
+        return False
+    return filename.lower().endswith('.zip') or filename in year_files
+
+
+def write_done_sentinel(
+    sentinel: str, file_size: str, file_hash: str, response: requests.Response
+) -> None:
+    """Record a completed download along with the response's cache validators."""
+    lines = [f"{file_size},{file_hash}"]
+    lines.extend(f"{name}: {value}" for name, value in response_validators(response).items())
+    try:
+        with open(sentinel, 'w', encoding='utf-8') as fh:
+            fh.write('\n'.join(lines))
+    except OSError as exc:
+        print(f"WARNING: Unable to record completed download {sentinel}: {exc}")
+
+
+def conditional_headers(sentinel: str | None, validators: dict[str, str]) -> dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers for revalidating a completed download.
+
+    Without a ``sentinel`` only the stored validators are used.
+    """
+    headers: dict[str, str] = {}
+    if 'ETag' in validators:
+        headers['If-None-Match'] = validators['ETag']
+    if 'Last-Modified' in validators:
+        headers['If-Modified-Since'] = validators['Last-Modified']
+    elif 'ETag' not in validators and sentinel is not None:
+        # Older sentinels carry no validators; the time the download finished is the next best.
+        try:
+            headers['If-Modified-Since'] = formatdate(os.path.getmtime(sentinel), usegmt=True)
+        except OSError:
+            pass
+    return headers
+
+
+def fetch_and_extract(
+    session: requests.Session,
+    url: str,
+    destination: str,
+    year_dir: str,
+    *,
+    context: str,
+    announce: str = '',
+    with_metadata: bool = False,
+    force: bool = False,
+    revalidate: bool = False,
+    sentinel_exists: bool | None = None,
+) -> tuple[str, str]:
+    """Download one file (rate limited), unzip archives, and return (filesize_bytes, sha256).
+
+    A ``<destination>.done`` sentinel records each completed download (archives are not kept
+    on disk once extracted), so later runs skip it and reuse the recorded size and hash
+    unless ``force`` is set.  With ``revalidate`` a completed download is re-requested
+    conditionally instead, and only fetched again if the server reports it changed.
+    ``sentinel_exists`` lets callers that already listed the directory skip probing for it.
+    """
+    sentinel = destination + DONE_SUFFIX
+    done = None if force or sentinel_exists is False else read_done_sentinel(sentinel)
+    extra_headers = None
+    if done is not None:
+        if not revalidate:
+            print(f"Skipping {context} (already downloaded)")
+            return done[:2] if with_metadata else ("", "")
+        extra_headers = conditional_headers(sentinel, done[2])
+    if announce:
+        print(announce)
+    DOWNLOAD_RATE_LIMITER.wait()
+    if destination.lower().endswith('.zip'):
+        # Extract straight from the downloaded body instead of writing, re-reading and deleting
+        # a zip in the year folder. Typical archives stay in memory; the few large ones (Access
+        # databases) spill to a temporary file so concurrent downloads cannot exhaust RAM.
+        with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_BYTES) as buffer:
+            response = download_file(session, url, destination, buffer=buffer, extra_headers=extra_headers)
+            if response is None:
+                return "", ""
+            if response.status_code == 304:
+                print(f"{context} is unchanged on the server")
+                return done[:2] if with_metadata else ("", "")
+            file_size, file_hash = compute_buffer_metadata(buffer)
+            print(f"Unzipping {context}...")
+            completed = unzip_buffer(buffer, destination, year_dir, context=context)
+    else:
+        response = download_file(session, url, destination, extra_headers=extra_headers)
+        if response is None:
+            return "", ""
+        if response.status_code == 304:
+            print(f"{context} is unchanged on the server")
+            return done[:2] if with_metadata else ("", "")
+        file_size, file_hash = compute_file_metadata(destination)
+        completed = True
+    if completed:
+        write_done_sentinel(sentinel, file_size, file_hash, response)
+    return (file_size, file_hash) if with_metadata else ("", "")
+
+
+def unzip_buffer(buffer: IO[bytes], zip_path: str, extract_to: str, *, context: str = '') -> bool:
+    """Extract a buffered zip next to where ``zip_path`` would have been written.
+
+    Archives that fail to open are written to ``zip_path`` so they can be inspected.
+    Returns True when extraction succeeded.
+    """
     base_name = os.path.splitext(os.path.basename(zip_path))[0]
     target_dir = os.path.join(extract_to, base_name)
     try:
-        os.makedirs(target_dir, exist_ok=True)
-        with zipfile.ZipFile(zip_path, 'r') as archive:
+        with zipfile.ZipFile(buffer, 'r') as archive:
+            os.makedirs(target_dir, exist_ok=True)
+            # Serial on purpose: IPEDS archives hold one or two members, and archives already
+            # extract concurrently on the DOWNLOAD_POOL threads that fetched them.
             archive.extractall(target_dir)
-        os.remove(zip_path)
         extracted_items = os.listdir(target_dir)
         if not extracted_items:
             print(
@@ -418,25 +788,40 @@ def unzip_and_remove(zip_path: str, extract_to: str, *, context: str = '') -> No
             )
         print(
             f"Unzipped {os.path.basename(zip_path)} into "
-            f"{os.path.relpath(target_dir, extract_to)} and removed archive"
+            f"{os.path.relpath(target_dir, extract_to)}"
         )
+        return True
     except zipfile.BadZipFile:
         print(f"WARNING: {os.path.basename(zip_path)} is not a valid zip file.")
+        try:
+            with open(zip_path, 'wb') as file_obj:
+                buffer.seek(0)
+                shutil.copyfileobj(buffer, file_obj)
+        except OSError as exc:
+            print(f"ERROR: Unable to write file {zip_path}: {exc}")
     except OSError as exc:
         print(f"ERROR: Unable to process {zip_path}: {exc}")
+    return False
+
+
+def index_dictionaries_by_row(dict_entries: list[dict]) -> dict[str | None, dict]:
+    """Map each row_id to its best dictionary; ``dict_entries`` must be priority-sorted."""
+    by_row: dict[str | None, dict] = {}
+    for entry in dict_entries:
+        by_row.setdefault(entry.get('row_id'), entry)
+    return by_row
 
 
 def find_dictionary_for_data(
-    dict_entries: list[dict], data_entry: dict
+    dict_entries: list[dict], data_entry: dict, dict_by_row: dict[str | None, dict]
 ) -> dict | None:
-    """Select the dictionary that shares a row_id with the data entry."""
+    """Select the dictionary that shares a row_id with the data entry.
+
+    Falls back to the overall best dictionary when none sits on the same row.
+    """
     if not dict_entries:
         return None
-
-    same_row = [entry for entry in dict_entries if entry.get('row_id') == data_entry.get('row_id')]
-    candidates = same_row or dict_entries
-    candidates.sort(key=lambda entry: entry['priority'], reverse=True)
-    return candidates[0]
+    return dict_by_row.get(data_entry.get('row_id'), dict_entries[0])
 
 
 def prepare_entries(entries: list[dict]) -> list[dict]:
@@ -445,7 +830,13 @@ def prepare_entries(entries: list[dict]) -> list[dict]:
 
 
 def download_access_database(
-    session: requests.Session, year: int, year_dir: str, access_entries: list[dict]
+    session: requests.Session,
+    year: int,
+    year_dir: str,
+    access_entries: list[dict],
+    *,
+    force: bool = False,
+    revalidate: bool = False,
 ) -> None:
     """Download the Access database for the year if the option is enabled."""
     if not access_entries:
@@ -455,11 +846,15 @@ def download_access_database(
     best_entry = max(access_entries, key=lambda entry: entry['priority'])
     destination = os.path.join(year_dir, best_entry['filename'])
     print(f"Downloading Access database {best_entry['filename']}...")
-    if download_file(session, best_entry['url'], destination):
-        if destination.lower().endswith('.zip'):
-            print(f"Unzipping {best_entry['filename']}...")
-            unzip_and_remove(destination, year_dir, context=best_entry['filename'])
-        time.sleep(1)
+    fetch_and_extract(
+        session,
+        best_entry['url'],
+        destination,
+        year_dir,
+        context=best_entry['filename'],
+        force=force,
+        revalidate=revalidate,
+    )
 
 
 def write_year_manifest(year_dir: str, year: int, rows: list[dict]) -> None:
@@ -467,157 +862,239 @@ def write_year_manifest(year_dir: str, year: int, rows: list[dict]) -> None:
     if not rows:
         return
     manifest_path = os.path.join(year_dir, f'{year}_manifest.csv')
-    fieldnames = [
-        'year',
-        'survey',
-        'prefix',
-        'filename',
-        'url',
-        'is_revision',
-        'has_dictionary',
-        'dictionary_filename',
-        'release',
-        'filesize_bytes',
-        'sha256',
-    ]
     try:
         with open(manifest_path, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
+            writer = csv.writer(csvfile)
+            writer.writerow(MANIFEST_FIELDS)
+            # itemgetter pulls each record's fields as a tuple in C, unlike DictWriter's
+            # per-field lookups and extra-key checks.
+            writer.writerows(map(itemgetter(*MANIFEST_FIELDS), rows))
         print(f"Wrote manifest with {len(rows)} rows to {manifest_path}")
     except OSError as exc:
         print(f"WARNING: Unable to write manifest for {year}: {exc}")
 
 
-def process_year(year: int, *, manifest_only: bool = False) -> None:
-    """Process downloads for a single year, handling all configured surveys."""
-    print(f"\n>>> Processing Year {year}...")
-    with requests.Session() as session:
-        session.headers.update(HEADERS)
-        retries = Retry(
-            total=5,
-            backoff_factor=0.5,
-            status_forcelist=[403, 429, 500, 502, 503, 504],
-            allowed_methods=['GET'],
-            respect_retry_after_header=True,
-        )
-        adapter = HTTPAdapter(max_retries=retries, pool_maxsize=MAX_WORKERS)
-        session.mount('https://', adapter)
-        session.mount('http://', adapter)
-        soup = fetch_year_page(session, year)
-        if soup is None:
-            return
+def build_session(pool_size: int) -> requests.Session:
+    """Create a retrying session whose keep-alive pool holds ``pool_size`` connections per host."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    retries = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[403, 429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
-        survey_links, access_entries = parse_year_links(soup, year)
-        try:
-            soup.decompose()
-        except Exception:
-            pass
-        del soup
 
-        year_dir = os.path.join(DOWNLOAD_DIR, str(year))
-        ensure_directory(year_dir)
-        year_manifest: list[dict] = []
+# One keep-alive pool shared by the year threads and the download threads, so the NCES host is
+# handshaked once per pooled connection rather than once per year.
+SESSION = build_session(MAX_WORKERS + DOWNLOAD_WORKERS)
+# Every year queues its files on this one pool, which caps concurrent downloads for the whole
+# run (rather than per year) while the year threads only scrape pages and wait on results.
+DOWNLOAD_POOL = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix='ipeds-download')
+
 
-        for survey_name in SURVEY_DEFINITIONS.keys():
-            prefix_groups = survey_links.get(survey_name, {})
+def process_year(
+    year: int,
+    *,
+    session: requests.Session | None = None,
+    manifest_only: bool = False,
+    force: bool = False,
+    revalidate: bool = False,
+) -> None:
+    """Process downloads for a single year, handling all configured surveys.
 
-            if not prefix_groups:
-                print(f"WARNING: Data files for survey {survey_name} not found for {year}.")
+    Requests go through the module-wide SESSION unless another ``session`` (e.g. from
+    ``build_session``, which carries HEADERS) is passed.
+    """
+    session = session or SESSION
+    print(f"\n>>> Processing Year {year}...")
+    year_dir = os.path.join(DOWNLOAD_DIR, str(year))
+    links_cache = os.path.join(year_dir, '_links.json')
+    cached_links = None if force else load_cached_links(links_cache)
+    refresh_cache = False
+    if cached_links is not None and links_cache_is_fresh(links_cache):
+        print(f"Using cached file list for {year} ({links_cache})")
+        survey_links, access_entries, _ = cached_links
+    else:
+        # A stale cache is revalidated with the validators its page was served with.
+        page_headers = conditional_headers(None, cached_links[2]) if cached_links else None
+        page = fetch_year_page(session, year, extra_headers=page_headers)
+        if page is None:
+            return
+        rows, page_validators = page
+        if rows is None:
+            print(f"File list for {year} unchanged since it was cached ({links_cache})")
+            survey_links, access_entries, _ = cached_links
+            try:
+                # Restart the freshness window.
+                os.utime(links_cache)
+            except OSError:
+                pass
+        else:
+            survey_links, access_entries = parse_year_links(rows, year)
+            refresh_cache = True
+            del rows
+
+    ensure_directory(year_dir)
+    if refresh_cache and survey_links:
+        save_cached_links(links_cache, survey_links, access_entries, page_validators)
+    # One listing of the year folder answers "already downloaded?" for every file below.
+    with os.scandir(year_dir) as entries:
+        year_files = {entry.name for entry in entries}
+    year_manifest: list[dict] = []
+    # Each job fills in its manifest record (when it has one) once the request completes.
+    jobs: list[tuple[dict | None, partial]] = []
+
+    for survey_name in SURVEY_DEFINITIONS.keys():
+        prefix_groups = survey_links.get(survey_name, {})
+
+        if not prefix_groups:
+            print(f"WARNING: Data files for survey {survey_name} not found for {year}.")
+            continue
+
+        for prefix_label, entry_group in prefix_groups.items():
+            data_entries = prepare_entries(entry_group.get('data', []))
+            dict_entries = prepare_entries(entry_group.get('dict', []))
+            dict_by_row = index_dictionaries_by_row(dict_entries)
+
+            if not data_entries:
+                print(
+                    f"WARNING: Data file for survey {survey_name} ({prefix_label}) "
+                    f"not found for {year}."
+                )
                 continue
 
-            for prefix_label, entry_group in prefix_groups.items():
-                data_entries = prepare_entries(entry_group.get('data', []))
-                dict_entries = prepare_entries(entry_group.get('dict', []))
+            if not dict_entries:
+                print(
+                    f"WARNING: Dictionary for survey {survey_name} ({prefix_label}) "
+                    f"not found for {year}."
+                )
 
-                if not data_entries:
-                    print(
-                        f"WARNING: Data file for survey {survey_name} ({prefix_label}) "
-                        f"not found for {year}."
+            downloaded_dicts: set[str] = set()
+            for data_entry in data_entries:
+                filename = data_entry['filename']
+                dict_entry = find_dictionary_for_data(dict_entries, data_entry, dict_by_row)
+                manifest_record = {
+                    'year': year,
+                    'survey': survey_name,
+                    'prefix': prefix_label,
+                    'filename': filename,
+                    'url': data_entry['url'],
+                    'is_revision': data_entry['is_revision'],
+                    'has_dictionary': bool(dict_entry),
+                    'dictionary_filename': dict_entry['filename'] if dict_entry else '',
+                    'release': data_entry.get('release', ''),
+                    'filesize_bytes': "",
+                    'sha256': "",
+                }
+                year_manifest.append(manifest_record)
+                if manifest_only:
+                    jobs.append((manifest_record, partial(fetch_remote_filesize, session, data_entry['url'])))
+                else:
+                    if data_entry['is_revision']:
+                        announce = (
+                            f"Downloading {filename} for {survey_name} ({prefix_label}) "
+                            "(Prioritizing revised file)"
+                        )
+                    else:
+                        announce = f"Downloading {filename} for {survey_name} ({prefix_label})..."
+                    jobs.append(
+                        (
+                            manifest_record,
+                            partial(
+                                fetch_and_extract,
+                                session,
+                                data_entry['url'],
+                                os.path.join(year_dir, filename),
+                                year_dir,
+                                context=filename,
+                                announce=announce,
+                                with_metadata=True,
+                                force=force,
+                                revalidate=revalidate,
+                                sentinel_exists=listed_as_done(filename, year_files),
+                            ),
+                        )
                     )
-                    continue
 
-                if not dict_entries:
+                if dict_entry is None:
                     print(
-                        f"WARNING: Dictionary for survey {survey_name} ({prefix_label}) "
-                        f"not found for {year}."
+                        f"WARNING: Matching dictionary not found for "
+                        f"{survey_name} ({prefix_label}) file {filename}."
                     )
+                    continue
 
-                downloaded_dicts: set[str] = set()
-                for data_entry in data_entries:
-                    filename = data_entry['filename']
-                    file_size = ""
-                    file_hash = ""
-                    if manifest_only:
-                        file_size = fetch_remote_filesize(session, data_entry['url'])
-                    else:
-                        if data_entry['is_revision']:
-                            print(
-                                f"Downloading {filename} for {survey_name} ({prefix_label}) "
-                                "(Prioritizing revised file)"
-                            )
-                        else:
-                            print(f"Downloading {filename} for {survey_name} ({prefix_label})...")
-                        destination = os.path.join(year_dir, filename)
-                        if download_file(session, data_entry['url'], destination):
-                            file_size, file_hash = compute_file_metadata(destination)
-                            if destination.lower().endswith('.zip'):
-                                print(f"Unzipping {filename}...")
-                                unzip_and_remove(destination, year_dir, context=filename)
-                            time.sleep(1)
-
-                    dict_entry = find_dictionary_for_data(dict_entries, data_entry)
-                    manifest_record = {
-                        'year': year,
-                        'survey': survey_name,
-                        'prefix': prefix_label,
-                        'filename': filename,
-                        'url': data_entry['url'],
-                        'is_revision': data_entry['is_revision'],
-                        'has_dictionary': bool(dict_entry),
-                        'dictionary_filename': dict_entry['filename'] if dict_entry else '',
-                        'release': data_entry.get('release', ''),
-                        'filesize_bytes': file_size,
-                        'sha256': file_hash,
-                    }
-                    year_manifest.append(manifest_record)
-
-                    if dict_entry is None:
-                        print(
-                            f"WARNING: Matching dictionary not found for "
-                            f"{survey_name} ({prefix_label}) file {filename}."
-                        )
-                        continue
-
-                    if manifest_only:
-                        continue
+                if manifest_only:
+                    continue
 
-                    dict_filename = dict_entry['filename']
-                    if dict_filename in downloaded_dicts:
-                        continue
+                dict_filename = dict_entry['filename']
+                if dict_filename in downloaded_dicts:
+                    continue
 
-                    if dict_entry['is_revision']:
-                        print(
-                            f"Downloading {dict_filename} for {survey_name} ({prefix_label}) "
-                            "(Prioritizing revised file)"
-                        )
-                    else:
-                        print(
-                            f"Downloading {dict_filename} for {survey_name} ({prefix_label})..."
-                        )
-                    dict_destination = os.path.join(year_dir, dict_filename)
-                    if download_file(session, dict_entry['url'], dict_destination):
-                        if dict_destination.lower().endswith('.zip'):
-                            print(f"Unzipping {dict_filename}...")
-                            unzip_and_remove(dict_destination, year_dir, context=dict_filename)
-                        time.sleep(1)
-                    downloaded_dicts.add(dict_filename)
+                if dict_entry['is_revision']:
+                    announce = (
+                        f"Downloading {dict_filename} for {survey_name} ({prefix_label}) "
+                        "(Prioritizing revised file)"
+                    )
+                else:
+                    announce = f"Downloading {dict_filename} for {survey_name} ({prefix_label})..."
+                jobs.append(
+                    (
+                        None,
+                        partial(
+                            fetch_and_extract,
+                            session,
+                            dict_entry['url'],
+                            os.path.join(year_dir, dict_filename),
+                            year_dir,
+                            context=dict_filename,
+                            announce=announce,
+                            force=force,
+                            revalidate=revalidate,
+                            sentinel_exists=listed_as_done(dict_filename, year_files),
+                        ),
+                    )
+                )
+                downloaded_dicts.add(dict_filename)
+
+    if DOWNLOAD_ACCESS_DATABASE and not manifest_only:
+        # The Access database is by far the largest download; queue it first so it overlaps the
+        # survey files instead of running after them.
+        jobs.insert(
+            0,
+            (
+                None,
+                partial(
+                    download_access_database,
+                    session,
+                    year,
+                    year_dir,
+                    access_entries,
+                    force=force,
+                    revalidate=revalidate,
+                ),
+            ),
+        )
 
-        if DOWNLOAD_ACCESS_DATABASE and not manifest_only:
-            download_access_database(session, year, year_dir, access_entries)
+    # Each download thread reuses a kept-alive connection from SESSION; the shared rate limiter
+    # replaces the old per-file sleep.
+    futures = [(record, DOWNLOAD_POOL.submit(job)) for record, job in jobs]
+    for record, future in futures:
+        result = future.result()
+        if record is None:
+            continue
+        if manifest_only:
+            record['filesize_bytes'] = result
+        else:
+            record['filesize_bytes'], record['sha256'] = result
 
-        write_year_manifest(year_dir, year, year_manifest)
+    write_year_manifest(year_dir, year, year_manifest)
 
 
 def _parse_years(expr: str | None) -> list[int]:
@@ -660,12 +1137,25 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Skip downloading files; only emit manifests (fetches Content-Length when possible).",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-scrape year pages and re-download files even when cached copies exist.",
+    )
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        help="Re-check completed downloads with conditional requests (ETag / If-Modified-Since) "
+        "and fetch only files that changed on the server.",
+    )
     args = parser.parse_args(argv)
     DOWNLOAD_DIR = args.out_root
     years = _parse_years(args.years)
 
     ensure_directory(DOWNLOAD_DIR)
-    worker = partial(process_year, manifest_only=args.manifest_only)
+    worker = partial(
+        process_year, manifest_only=args.manifest_only, force=args.force, revalidate=args.revalidate
+    )
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         list(executor.map(worker, years))
 
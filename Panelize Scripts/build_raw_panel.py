@@ -4,13 +4,25 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import importlib.util
 import logging
+import os
 import re
+import shutil
 import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Iterator, Optional, Set
+from typing import Iterable, Iterator, Optional, Set
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 SUPPORTED_SUFFIXES = {".csv", ".tsv", ".txt", ".xlsx", ".xls"}
 SURVEY_PATTERNS: list[tuple[str, list[str]]] = [
@@ -32,9 +44,53 @@ SURVEY_PATTERNS: list[tuple[str, list[str]]] = [
     ("ADM", [r"ADM\d{4}"]),
     ("GR", [r"GR\d{4}"]),
 ]
+# One anchored alternation tried in SURVEY_PATTERNS order: each branch is a lookahead search for
+# that survey's patterns followed by an empty named group, so match.lastgroup names the first
+# survey that matches anywhere in the stem (the same priority the per-pattern loop had).
+SURVEY_RE = re.compile(
+    "^(?:"
+    + "|".join(
+        f"(?=.*?(?:{'|'.join(patterns)}))(?P<{survey}>)" for survey, patterns in SURVEY_PATTERNS
+    )
+    + ")"
+)
+FIN_STEM_RE = re.compile(r"^F\d{4}_")
 
 F1_COMPONENT_YEARS = {2004, 2005, 2006, 2007}
 
+# Long-form layout of every per-file table; fixed so each file can go straight to the parquet writer.
+# Labels stay plain strings in the schema (dictionary types would load as pandas categoricals, which
+# blow up unobserved-category pivots downstream); parquet still dictionary-encodes them on disk.
+PANEL_SCHEMA = pa.schema(
+    [
+        ("UNITID", pa.int64()),
+        ("source_var", pa.string()),
+        ("value", pa.string()),
+        ("year", pa.int64()),
+        ("survey", pa.string()),
+        ("source_file", pa.string()),
+        ("reporting_unitid", pa.int64()),
+    ]
+)
+
+# pandas' default NA tokens, so Arrow-read files null out the same cells as read_csv(dtype=str).
+CSV_NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+# python-calamine (optional) parses .xlsx in Rust; without it pandas uses openpyxl, which it already
+# opens read-only. pandas only accepts engine="calamine" from 2.2 on (requirements allow 2.0).
+_PANDAS_VERSION = tuple(int(part) for part in re.findall(r"\d+", pd.__version__)[:2])
+XLSX_ENGINE = (
+    "calamine"
+    if _PANDAS_VERSION >= (2, 2) and importlib.util.find_spec("python_calamine") is not None
+    else None
+)
+
+# (level, message) pairs a worker hands back for the parent process to log.
+LogMessages = list[tuple[int, str]]
+
 
 def detect_f1_component_suffix(path: Path) -> str | None:
     for part in path.parts:
@@ -60,9 +116,15 @@ def rename_f1_component_columns(df: pd.DataFrame, component: str) -> pd.DataFram
 
 
 def infer_year(path: Path) -> int | None:
-    for parent in path.parents:
-        if parent.name.isdigit():
-            return int(parent.name)
+    # The downloader writes ``<root>/<year>/file`` and unzips into ``<root>/<year>/<archive>/file``,
+    # so check those two slots directly before walking any deeper nesting.
+    parts = path.parts
+    for name in parts[-2:-4:-1]:
+        if name.isdigit():
+            return int(name)
+    for name in reversed(parts[:-3]):
+        if name.isdigit():
+            return int(name)
     return None
 
 
@@ -70,24 +132,26 @@ def infer_survey(path: Path) -> str:
     candidates = [path.stem] + [parent.name for parent in path.parents]
     for candidate in candidates:
         stem = str(candidate).upper()
-        if re.match(r"^F\d{4}_", stem) and not stem.startswith("FALL"):
+        if FIN_STEM_RE.match(stem) and not stem.startswith("FALL"):
             return "FIN"
-        for survey, patterns in SURVEY_PATTERNS:
-            for pattern in patterns:
-                if re.search(pattern, stem):
-                    return survey
+        match = SURVEY_RE.match(stem)
+        if match:
+            return match.lastgroup
     return "UNK"
 
 
-def find_unitid_column(df: pd.DataFrame) -> str | None:
-    candidates = {
-        col
-        for col in df.columns
-        if isinstance(col, str) and col.strip().upper().startswith("UNITID")
-    }
-    if not candidates:
-        return None
-    return sorted(candidates, key=lambda c: (len(c), c))[0]
+def find_unitid_column(columns: Iterable[object]) -> str | None:
+    # Shortest matching name wins, ties broken lexically; track the best in one pass.
+    best: str | None = None
+    for col in columns:
+        if col == "UNITID":
+            # Nothing can sort before the exact upper-case name.
+            return col
+        if not isinstance(col, str) or not col.strip().upper().startswith("UNITID"):
+            continue
+        if best is None or (len(col), col) < (len(best), best):
+            best = col
+    return best
 
 
 def parse_years(expr: Optional[str]) -> Optional[Set[int]]:
@@ -115,15 +179,33 @@ def parse_surveys(expr: Optional[str]) -> Optional[Set[str]]:
     return surveys if surveys else None
 
 
-def iter_data_files(root: Path, years: Optional[Set[int]], surveys: Optional[Set[str]]) -> Iterator[tuple[Path, int, str]]:
-    for path in root.rglob("*"):
-        if not path.is_file():
-            continue
-        if path.suffix.lower() not in SUPPORTED_SUFFIXES:
-            continue
-        # Skip dictionaries/documentation directories
-        if any("dict" in part.lower() for part in path.parts):
+def _walk_candidate_files(root: Path) -> Iterator[Path]:
+    """Depth-first walk in ``rglob`` order, pruning dictionary folders and unsupported suffixes by name."""
+    # Skip dictionaries/documentation directories
+    if any("dict" in part.lower() for part in root.parts):
+        return
+    stack = [os.fspath(root)]
+    while stack:
+        subdirs: list[str] = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if "dict" in name.lower():
+                        continue
+                    # Like rglob, do not descend into symlinked directories (avoids cycles and
+                    # files outside the tree).
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif os.path.splitext(name)[1].lower() in SUPPORTED_SUFFIXES and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
             continue
+        stack.extend(reversed(subdirs))
+
+
+def iter_data_files(root: Path, years: Optional[Set[int]], surveys: Optional[Set[str]]) -> Iterator[tuple[Path, int, str]]:
+    for path in _walk_candidate_files(root):
         year = infer_year(path)
         if years is not None and year not in years:
             continue
@@ -138,68 +220,330 @@ def iter_data_files(root: Path, years: Optional[Set[int]], surveys: Optional[Set
         yield path, year, survey
 
 
-def read_table(path: Path) -> pd.DataFrame | None:
+def sniff_encoding(path: Path, sample_bytes: int = 65536) -> str:
+    """Guess a text file's encoding from its head: UTF-8 if it decodes cleanly, else cp1252.
+
+    IPEDS exports are either UTF-8 or Windows-1252; latin-1 covers the few bytes cp1252 leaves
+    undefined, so the result always decodes the sample.
+    """
+    with open(path, "rb") as fh:
+        head = fh.read(sample_bytes)
+    try:
+        # Incremental decode tolerates a multi-byte character cut off at the sample boundary.
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        head.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def _read_delimited_arrow(path: Path, delimiter: str, encoding: str) -> pd.DataFrame | None:
+    """Parse a delimited file with Arrow's multithreaded reader as all-string columns.
+
+    Column names come from pandas' header parse so unnamed/duplicate headers match ``read_csv``.
+    Returns None when the file needs pandas' lenient handling (bytes that do not decode as
+    ``encoding`` past the sniffed head, or ragged rows).
+    """
+    try:
+        names = [str(col) for col in pd.read_csv(path, sep=delimiter, nrows=0, encoding=encoding).columns]
+    except UnicodeDecodeError:
+        return None
+    invalid_rows: list[pacsv.InvalidRow] = []
+
+    def skip_invalid(row: pacsv.InvalidRow) -> str:
+        invalid_rows.append(row)
+        return "skip"
+
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(column_names=names, skip_rows=1, encoding=encoding),
+            parse_options=pacsv.ParseOptions(
+                delimiter=delimiter, newlines_in_values=True, invalid_row_handler=skip_invalid
+            ),
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in names},
+                null_values=CSV_NULL_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
+    except (pa.ArrowInvalid, UnicodeDecodeError):
+        return None
+    if invalid_rows:
+        # pandas pads short rows rather than dropping them; let it handle ragged files.
+        return None
+    return table.to_pandas()
+
+
+def _peek_columns(path: Path, encoding: str) -> list[str] | None:
+    """Column names from a delimited file's header row alone, or None when only a full read can tell.
+
+    Workbooks and headers that fail to parse return None so the caller falls through to ``_read_table``.
+    """
     suffix = path.suffix.lower()
+    if suffix == ".csv":
+        sep, engine = ",", "c"
+    elif suffix == ".tsv":
+        sep, engine = "\t", "c"
+    elif suffix == ".txt":
+        sep, engine = None, "python"
+    else:
+        return None
     try:
-        if suffix == ".csv":
-            try:
-                return pd.read_csv(path, dtype=str, encoding_errors="ignore", on_bad_lines="skip")
-            except Exception:
-                return pd.read_csv(path, dtype=str, engine="python", encoding_errors="ignore", on_bad_lines="skip")
-        if suffix == ".tsv":
-            return pd.read_csv(path, dtype=str, sep="\t", encoding_errors="ignore", on_bad_lines="skip")
-        if suffix == ".txt":
-            try:
-                return pd.read_csv(path, dtype=str, sep=None, engine="python", encoding_errors="ignore", on_bad_lines="skip")
-            except Exception:
-                return pd.read_csv(path, dtype=str, delim_whitespace=True, encoding_errors="ignore", on_bad_lines="skip")
-        if suffix in {".xlsx", ".xls"}:
-            return pd.read_excel(path, dtype=str)
+        header = pd.read_csv(path, sep=sep, engine=engine, nrows=0, encoding=encoding, encoding_errors="ignore")
+    except Exception:  # noqa: BLE001
+        return None
+    return [str(col) for col in header.columns]
+
+
+def _read_table(path: Path, encoding: str | None = None) -> pd.DataFrame | None:
+    suffix = path.suffix.lower()
+    if suffix == ".xlsx":
+        return pd.read_excel(path, dtype=str, engine=XLSX_ENGINE)
+    if suffix == ".xls":
+        # Legacy workbooks stay on xlrd.
+        return pd.read_excel(path, dtype=str)
+    if suffix not in {".csv", ".tsv", ".txt"}:
+        return None
+    # Decode with the file's real encoding; encoding_errors="ignore" stays only as a safety net
+    # for stray bytes beyond the sniffed head.
+    encoding = encoding or sniff_encoding(path)
+    if suffix == ".csv":
+        df = _read_delimited_arrow(path, ",", encoding)
+        if df is not None:
+            return df
+        try:
+            return pd.read_csv(path, dtype=str, encoding=encoding, encoding_errors="ignore", on_bad_lines="skip")
+        except Exception:
+            return pd.read_csv(
+                path, dtype=str, engine="python", encoding=encoding, encoding_errors="ignore", on_bad_lines="skip"
+            )
+    if suffix == ".tsv":
+        df = _read_delimited_arrow(path, "\t", encoding)
+        if df is not None:
+            return df
+        return pd.read_csv(path, dtype=str, sep="\t", encoding=encoding, encoding_errors="ignore", on_bad_lines="skip")
+    try:
+        return pd.read_csv(
+            path, dtype=str, sep=None, engine="python", encoding=encoding, encoding_errors="ignore", on_bad_lines="skip"
+        )
+    except Exception:
+        return pd.read_csv(
+            path, dtype=str, delim_whitespace=True, encoding=encoding, encoding_errors="ignore", on_bad_lines="skip"
+        )
+
+
+def read_table(path: Path) -> pd.DataFrame | None:
+    try:
+        return _read_table(path)
     except Exception as exc:  # noqa: BLE001
         logging.warning("Failed to read %s (%s)", path, exc)
         return None
-    return None
 
 
-def build_raw_panel(root: Path, years: Optional[Set[int]], surveys: Optional[Set[str]]) -> pd.DataFrame:
-    frames: list[pd.DataFrame] = []
+def melt_to_table(df: pd.DataFrame, unitid_col: str, year: int, survey: str, source_file: str) -> pa.Table | None:
+    """Unpivot ``df`` into PANEL_SCHEMA in the same column-major row order as ``DataFrame.melt``."""
+    unitid_pos = df.columns.get_loc(unitid_col)
+    value_pos = [i for i, col in enumerate(df.columns) if i != unitid_pos and pd.notna(col)]
+    if not value_pos:
+        return None
+    n_rows = len(df)
+    n_cols = len(value_pos)
+    n_long = n_rows * n_cols
+    # Long row j*R + i is (row i, value column j): ids tile, variable names repeat.
+    unitids = pa.array(df.iloc[:, unitid_pos].to_numpy()).cast(pa.int64()).to_numpy()
+    unitid_arr = pa.array(np.tile(unitids, n_cols))
+    source_vars = pa.array([str(df.columns[i]) for i in value_pos], type=pa.string())
+    source_var_arr = source_vars.take(pa.array(np.repeat(np.arange(n_cols, dtype=np.int32), n_rows)))
+    # Values stay columnar: ravelling a 2D object array would box every cell as a Python str.
+    value_arr = pa.concat_arrays(
+        [pa.array(df.iloc[:, i], type=pa.string(), from_pandas=True) for i in value_pos]
+    )
+    return pa.Table.from_arrays(
+        [
+            unitid_arr,
+            source_var_arr,
+            value_arr,
+            pa.repeat(pa.scalar(year, pa.int64()), n_long),
+            pa.repeat(pa.scalar(survey, pa.string()), n_long),
+            pa.repeat(pa.scalar(source_file, pa.string()), n_long),
+            unitid_arr,
+        ],
+        schema=PANEL_SCHEMA,
+    )
+
+
+def _process_one(file_path: Path, year: int, survey: str) -> tuple[pa.Table | None, LogMessages]:
+    """Read and melt one data file; runs in a worker process, so log lines are returned, not emitted."""
+    messages: LogMessages = []
+    encoding = None
+    try:
+        if file_path.suffix.lower() in {".csv", ".tsv", ".txt"}:
+            # Dictionary/metadata files that slip past the name filters are rejected on their header
+            # alone, before paying for a full parse.
+            encoding = sniff_encoding(file_path)
+            columns = _peek_columns(file_path, encoding)
+            if columns is not None and not find_unitid_column(columns):
+                messages.append((logging.DEBUG, f"Skipping {file_path} (UNITID column missing)"))
+                return None, messages
+        df = _read_table(file_path, encoding)
+    except Exception as exc:  # noqa: BLE001
+        messages.append((logging.WARNING, f"Failed to read {file_path} ({exc})"))
+        return None, messages
+    if df is None or df.empty:
+        return None, messages
+    unitid_col = find_unitid_column(df.columns)
+    if not unitid_col:
+        messages.append((logging.DEBUG, f"Skipping {file_path} (UNITID column missing)"))
+        return None, messages
+    # read_table hands back a freshly parsed frame, so the UNITID coercion below can work in place.
+    component_suffix = None
+    if year in F1_COMPONENT_YEARS:
+        component_suffix = detect_f1_component_suffix(file_path)
+    if component_suffix:
+        df = rename_f1_component_columns(df, component_suffix)
+    df[unitid_col] = pd.to_numeric(df[unitid_col], errors="coerce")
+    df.dropna(subset=[unitid_col], inplace=True)
+    if df.empty:
+        return None, messages
+    return melt_to_table(df, unitid_col, year, survey, str(file_path)), messages
+
+
+def _process_one_star(task: tuple[Path, int, str]) -> tuple[pa.Table | None, LogMessages]:
+    return _process_one(*task)
+
+
+def build_raw_panel(
+    root: Path,
+    years: Optional[Set[int]],
+    surveys: Optional[Set[str]],
+    workers: Optional[int] = None,
+) -> Iterator[pa.Table]:
+    """Yield one long-form table per usable data file under ``root``."""
+    tasks: list[tuple[Path, int, str]] = []
     for file_path, year, survey in iter_data_files(root, years, surveys):
         if year is None:
             logging.debug("Skipping %s (no year folder)", file_path)
             continue
-        df = read_table(file_path)
-        if df is None or df.empty:
-            continue
-        unitid_col = find_unitid_column(df)
-        if not unitid_col:
-            logging.debug("Skipping %s (UNITID column missing)", file_path)
-            continue
-        df = df.copy()
-        component_suffix = None
-        if year in F1_COMPONENT_YEARS:
-            component_suffix = detect_f1_component_suffix(file_path)
-        if component_suffix:
-            df = rename_f1_component_columns(df, component_suffix)
-        df[unitid_col] = pd.to_numeric(df[unitid_col], errors="coerce")
-        df.dropna(subset=[unitid_col], inplace=True)
-        if df.empty:
-            continue
-        value_cols = [c for c in df.columns if c != unitid_col]
-        if not value_cols:
-            continue
-        melted = df.melt(id_vars=[unitid_col], value_vars=value_cols, var_name="source_var", value_name="value")
-        melted.dropna(subset=["source_var"], inplace=True)
-        melted.rename(columns={unitid_col: "UNITID"}, inplace=True)
-        melted["year"] = year
-        melted["survey"] = survey
-        melted["source_file"] = str(file_path)
-        frames.append(melted)
-    if not frames:
+        tasks.append((file_path, year, survey))
+    # Warnings are collected and reported once at the end rather than interleaved per file.
+    failures: list[str] = []
+    max_workers = workers or os.cpu_count() or 1
+    try:
+        # Files parse independently, so fan them out across processes.  Only a bounded window of
+        # futures is in flight and results are consumed oldest first, so file order is kept and
+        # finished tables cannot pile up in memory while the writer is slower than the workers.
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending_tasks = iter(tasks)
+            in_flight: deque[Future] = deque(
+                executor.submit(_process_one_star, task) for task in islice(pending_tasks, 2 * max_workers)
+            )
+            while in_flight:
+                table, messages = in_flight.popleft().result()
+                next_task = next(pending_tasks, None)
+                if next_task is not None:
+                    in_flight.append(executor.submit(_process_one_star, next_task))
+                for level, message in messages:
+                    if level >= logging.WARNING:
+                        failures.append(message)
+                    else:
+                        logging.log(level, message)
+                if table is not None:
+                    yield table
+    finally:
+        if failures:
+            logging.warning("%d read failure(s):\n  %s", len(failures), "\n  ".join(failures))
+
+
+def write_panel(
+    tables: Iterable[pa.Table], output: Path, compression: str, compression_level: Optional[int]
+) -> int:
+    """Append each table as its own row group, never holding more than one file's rows.
+
+    Rows go to a sibling ``.partial`` file that replaces ``output`` only once every table is
+    written, so a failed run cannot leave a truncated panel (or clobber the previous one).
+    """
+    partial = output.with_name(output.name + ".partial")
+    writer: pq.ParquetWriter | None = None
+    total_rows = 0
+    try:
+        for table in tables:
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    partial,
+                    PANEL_SCHEMA,
+                    compression=compression,
+                    compression_level=compression_level,
+                    use_dictionary=["source_var", "survey", "source_file"],
+                )
+            writer.write_table(table)
+            total_rows += table.num_rows
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        partial.unlink(missing_ok=True)
+        raise
+    if writer is None:
         raise RuntimeError("No usable data files found under root.")
-    panel = pd.concat(frames, ignore_index=True)
-    panel["UNITID"] = panel["UNITID"].astype("Int64")
-    panel["reporting_unitid"] = panel["UNITID"]
-    return panel
+    writer.close()
+    os.replace(partial, output)
+    return total_rows
+
+
+def write_panel_dataset(
+    tables: Iterable[pa.Table],
+    output: Path,
+    partition_by: list[str],
+    compression: str,
+    compression_level: Optional[int],
+) -> int:
+    """Stream tables into a hive-partitioned dataset (``output/survey=HD/year=2018/part-0.parquet``).
+
+    Readers can then prune partitions by survey/year instead of scanning the whole panel. As with
+    ``write_panel``, the dataset is built in a ``.partial`` directory and swapped in at the end.
+    """
+    partial = output.with_name(output.name + ".partial")
+    shutil.rmtree(partial, ignore_errors=True)
+    total_rows = 0
+    seen_table = False
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        nonlocal total_rows, seen_table
+        for table in tables:
+            seen_table = True
+            total_rows += table.num_rows
+            yield from table.to_batches()
+
+    try:
+        ds.write_dataset(
+            batches(),
+            partial,
+            schema=PANEL_SCHEMA,
+            format="parquet",
+            partitioning=ds.partitioning(
+                pa.schema([PANEL_SCHEMA.field(name) for name in partition_by]), flavor="hive"
+            ),
+            basename_template="part-{i}.parquet",
+            file_options=ds.ParquetFileFormat().make_write_options(
+                compression=compression, compression_level=compression_level
+            ),
+        )
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+    if not seen_table:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise RuntimeError("No usable data files found under root.")
+    if output.is_dir():
+        shutil.rmtree(output)
+    elif output.exists():
+        output.unlink()
+    os.replace(partial, output)
+    return total_rows
 
 
 def parse_args() -> argparse.Namespace:
@@ -208,6 +552,20 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output", type=Path, required=True, help="Parquet output path")
     parser.add_argument("--years", type=str, default=None, help="Comma list or ranges (e.g., 2004,2006-2008)")
     parser.add_argument("--surveys", type=str, default=None, help="Comma list of survey tokens (HD,IC,IC_AY,EF,E12,ADM,SFA,FIN,GR)")
+    parser.add_argument("--compression", default="zstd", help="Parquet compression codec (default: zstd)")
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=None,
+        help="Codec level for the parquet output (default: 3 for zstd, codec default otherwise)",
+    )
+    parser.add_argument(
+        "--partition-by",
+        type=str,
+        default=None,
+        help="Comma list of columns (e.g., survey,year) to write --output as a hive-partitioned dataset directory",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for reading files (default: CPU count)")
     parser.add_argument("--log-level", default="INFO", help="Logging level")
     return parser.parse_args()
 
@@ -224,10 +582,21 @@ def main() -> int:
         logging.info("Restricting to surveys: %s", ",".join(sorted(surveys)))
     if years:
         logging.info("Restricting to years: %s", ",".join(str(y) for y in sorted(years)))
-    panel = build_raw_panel(args.root, years, surveys)
+    compression_level = args.compression_level
+    if compression_level is None and args.compression.lower() == "zstd":
+        compression_level = 3
+    partition_by = [name.strip() for name in (args.partition_by or "").split(",") if name.strip()]
+    unknown = [name for name in partition_by if name not in PANEL_SCHEMA.names]
+    if unknown:
+        logging.error("Unknown --partition-by columns: %s", ",".join(unknown))
+        return 1
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    panel.to_parquet(args.output, index=False)
-    logging.info("Wrote %s rows to %s", len(panel), args.output)
+    tables = build_raw_panel(args.root, years, surveys, args.workers)
+    if partition_by:
+        total_rows = write_panel_dataset(tables, args.output, partition_by, args.compression, compression_level)
+    else:
+        total_rows = write_panel(tables, args.output, args.compression, compression_level)
+    logging.info("Wrote %s rows to %s", total_rows, args.output)
     return 0
 
 
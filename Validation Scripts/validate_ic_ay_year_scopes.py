@@ -5,6 +5,7 @@ import re
 from pathlib import Path
 from typing import Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -65,57 +66,60 @@ def add_label_year_info(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def compute_concept_coverage(df: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-    for concept_key, sub in df.groupby("concept_key", dropna=False):
-        ys = sub["year_start"].dropna().astype(int)
-        ye = sub["year_end"].dropna().astype(int)
-        if ys.empty or ye.empty:
-            min_year = None
-            max_year = None
-        else:
-            min_year = ys.min()
-            max_year = ye.max()
-        lstart = sub["label_year_start"].dropna()
-        lend = sub["label_year_end"].dropna()
-        label_year_min = int(lstart.min()) if not lstart.empty else None
-        label_year_max = int(lend.max()) if not lend.empty else None
-
-        rows.append(
-            {
-                "concept_key": concept_key,
-                "n_rows": len(sub),
-                "min_year": min_year,
-                "max_year": max_year,
-                "label_year_min": label_year_min,
-                "label_year_max": label_year_max,
-            }
-        )
-    cov = pd.DataFrame(rows)
+    codes, uniques = pd.factorize(df["concept_key"], use_na_sentinel=False)
+    numeric = pd.DataFrame(
+        {
+            "_code": codes,
+            "year_start": pd.to_numeric(df["year_start"], errors="coerce").to_numpy(),
+            "year_end": pd.to_numeric(df["year_end"], errors="coerce").to_numpy(),
+            "label_year_start": pd.to_numeric(df["label_year_start"], errors="coerce").to_numpy(),
+            "label_year_end": pd.to_numeric(df["label_year_end"], errors="coerce").to_numpy(),
+        }
+    )
+    grouped = numeric.groupby("_code", sort=False).agg(
+        n_rows=("_code", "size"),
+        min_year=("year_start", "min"),
+        max_year=("year_end", "max"),
+        label_year_min=("label_year_start", "min"),
+        label_year_max=("label_year_end", "max"),
+    )
+    # A concept only gets a year span when both bounds are observed.
+    no_span = grouped["min_year"].isna() | grouped["max_year"].isna()
+    grouped.loc[no_span, ["min_year", "max_year"]] = pd.NA
+    for col in ("min_year", "max_year", "label_year_min", "label_year_max"):
+        grouped[col] = grouped[col].astype("Int64")
+    cov = grouped.reset_index(drop=True)
+    cov.insert(0, "concept_key", uniques.take(grouped.index.to_numpy()))
     return cov.sort_values(["concept_key"]).reset_index(drop=True)
 
 
 def compute_coverage_gaps(df: pd.DataFrame, cov: pd.DataFrame) -> pd.DataFrame:
-    years = pd.concat([df["year_start"], df["year_end"]]).dropna().astype(int)
-    if years.empty:
+    years = np.concatenate(
+        [
+            df["year_start"].to_numpy(dtype="float64", na_value=np.nan),
+            df["year_end"].to_numpy(dtype="float64", na_value=np.nan),
+        ]
+    )
+    if np.isnan(years).all():
         global_min = global_max = None
         full_set: set[int] = set()
     else:
-        global_min = int(years.min())
-        global_max = int(years.max())
+        global_min = int(np.nanmin(years))
+        global_max = int(np.nanmax(years))
         full_set = set(range(global_min, global_max + 1))
 
+    # Bucket rows by concept once instead of re-filtering the crosswalk per concept.
+    spans: dict[str, list[tuple[int, int]]] = {}
+    for concept, sub in df.groupby("concept_key", sort=False):
+        bounds = sub[["year_start", "year_end"]].dropna()
+        spans[concept] = list(zip(bounds["year_start"].astype(int), bounds["year_end"].astype(int)))
+
     gap_rows = []
     for _, row in cov.iterrows():
         concept = row["concept_key"]
-        sub = df[df["concept_key"] == concept]
         covered_years: set[int] = set()
-        for _, r in sub.iterrows():
-            ys = r["year_start"]
-            ye = r["year_end"]
-            if pd.isna(ys) or pd.isna(ye):
-                continue
-            for year in range(int(ys), int(ye) + 1):
-                covered_years.add(year)
+        for ys, ye in spans.get(concept, []):
+            covered_years.update(range(ys, ye + 1))
         if not covered_years:
             missing_years = sorted(full_set)
             coverage_min = row["min_year"]
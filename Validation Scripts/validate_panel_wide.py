@@ -8,7 +8,7 @@ import logging
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -26,6 +26,10 @@ SOFT_RULES = {
     "enrollment_exceeds_admits",
 }
 
+PCT_SKIP_TOKENS = ("SAT_", "ACT_", "SAT", "ACT")
+
+ColumnClasses = Dict[str, List[str]]
+
 
 def classify_rule(rule: str) -> str:
     if rule in HARD_RULES:
@@ -34,6 +38,56 @@ def classify_rule(rule: str) -> str:
         return "soft"
     return "soft"
 
+
+def as_numeric(series: pd.Series) -> pd.Series:
+    """Return ``series`` unchanged when already numeric, else a coerced copy (the frame is untouched)."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    return pd.to_numeric(series, errors="coerce")
+
+
+def downcast_numeric(df: pd.DataFrame, exclude: Tuple[str, ...] = ()) -> pd.DataFrame:
+    """Shrink float64/int64 columns in place where the narrower type is lossless.
+
+    The cleaned panel is written from the same frame, so a float64 column is only
+    moved to float32 when every value survives the round trip unchanged.
+    """
+    for col in df.select_dtypes(include=["float64"]).columns:
+        if col in exclude:
+            continue
+        values = df[col].to_numpy()
+        narrowed = values.astype(np.float32)
+        exact = (narrowed.astype(np.float64) == values) | np.isnan(values)
+        if exact.all():
+            df[col] = narrowed
+    for col in df.select_dtypes(include=["int64"]).columns:
+        if col in exclude:
+            continue
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+def classify_columns(columns: Sequence[str]) -> ColumnClasses:
+    """Bucket panel columns by the checks that consume them, in one scan."""
+    classes: ColumnClasses = {
+        "net_price_cols": [],
+        "pct_cols": [],
+        "pct_skip_cols": [],
+        "enroll_cols": [],
+    }
+    for col in columns:
+        if col.startswith("SFA__NET_PRICE"):
+            classes["net_price_cols"].append(col)
+        if col.startswith("ENROLL__") and "HEAD" in col:
+            classes["enroll_cols"].append(col)
+        if "_PCT" in col or "_RATE" in col:
+            if any(token in col for token in PCT_SKIP_TOKENS):
+                classes["pct_skip_cols"].append(col)
+            else:
+                classes["pct_cols"].append(col)
+    return classes
+
+
 @dataclass
 class RuleViolation:
     unitid: int | float | None
@@ -72,6 +126,8 @@ def load_panel(path: Path) -> pd.DataFrame:
     else:
         status_dtype = None
 
+    downcast_numeric(df, exclude=("UNITID", "YEAR", "STABLE_PRNTCHLD_STATUS"))
+
     logging.info(
         "Column dtypes - UNITID: %s, YEAR: %s%s",
         df["UNITID"].dtype,
@@ -81,7 +137,7 @@ def load_panel(path: Path) -> pd.DataFrame:
     return df
 
 
-def check_no_duplicates(df: pd.DataFrame) -> List[RuleViolation]:
+def check_no_duplicates(df: pd.DataFrame, col_classes: ColumnClasses) -> List[RuleViolation]:
     dup_mask = df.duplicated(subset=["UNITID", "YEAR"])
     violations: List[RuleViolation] = []
     if dup_mask.any():
@@ -93,7 +149,7 @@ def check_no_duplicates(df: pd.DataFrame) -> List[RuleViolation]:
     return violations
 
 
-def check_parent_child_status(df: pd.DataFrame) -> List[RuleViolation]:
+def check_parent_child_status(df: pd.DataFrame, col_classes: ColumnClasses) -> List[RuleViolation]:
     if "STABLE_PRNTCHLD_STATUS" not in df.columns:
         logging.info("STABLE_PRNTCHLD_STATUS not present; skipping parent/child validation.")
         return []
@@ -113,11 +169,11 @@ def check_parent_child_status(df: pd.DataFrame) -> List[RuleViolation]:
     return violations
 
 
-def check_net_price(df: pd.DataFrame) -> List[RuleViolation]:
-    cols = [c for c in df.columns if c.startswith("SFA__NET_PRICE")]
+def check_net_price(df: pd.DataFrame, col_classes: ColumnClasses) -> List[RuleViolation]:
+    cols = col_classes["net_price_cols"]
     violations: List[RuleViolation] = []
     for col in cols:
-        series = pd.to_numeric(df[col], errors="coerce")
+        series = as_numeric(df[col])
         neg_mask = series < 0
         high_mask = series > 200_000
         for mask, rule in [(neg_mask, "net_price_negative"), (high_mask, "net_price_too_high")]:
@@ -128,7 +184,7 @@ def check_net_price(df: pd.DataFrame) -> List[RuleViolation]:
     return violations
 
 
-def check_finance(df: pd.DataFrame) -> List[RuleViolation]:
+def check_finance(df: pd.DataFrame, col_classes: ColumnClasses) -> List[RuleViolation]:
     violations: List[RuleViolation] = []
     finance_checks = [
         ("FINANCE__IS_REVENUES_TOTAL", lambda s: s < 0, "finance_revenue_negative"),
@@ -141,7 +197,7 @@ def check_finance(df: pd.DataFrame) -> List[RuleViolation]:
         if col not in df.columns:
             logging.warning("Finance check skipped; column %s missing.", col)
             continue
-        series = pd.to_numeric(df[col], errors="coerce")
+        series = as_numeric(df[col])
         mask = condition(series)
         mask = mask.fillna(False)
         if mask.any():
@@ -151,8 +207,8 @@ def check_finance(df: pd.DataFrame) -> List[RuleViolation]:
 
     # Difference check
     if {"FINANCE__IS_REVENUES_TOTAL", "FINANCE__IS_EXPENSES_TOTAL"} <= set(df.columns):
-        rev = pd.to_numeric(df["FINANCE__IS_REVENUES_TOTAL"], errors="coerce")
-        exp = pd.to_numeric(df["FINANCE__IS_EXPENSES_TOTAL"], errors="coerce")
+        rev = as_numeric(df["FINANCE__IS_REVENUES_TOTAL"])
+        exp = as_numeric(df["FINANCE__IS_EXPENSES_TOTAL"])
         valid = (rev > 0) & (exp > 0)
         denom = rev.where(rev.abs() >= exp.abs(), exp.abs())
         denom = denom.where(denom != 0)
@@ -171,7 +227,7 @@ def check_finance(df: pd.DataFrame) -> List[RuleViolation]:
     return violations
 
 
-def check_admissions(df: pd.DataFrame) -> List[RuleViolation]:
+def check_admissions(df: pd.DataFrame, col_classes: ColumnClasses) -> List[RuleViolation]:
     req = [
         "ADM__ADM_N_APPLICANTS_TOTAL",
         "ADM__ADM_N_ADMITTED_TOTAL",
@@ -180,9 +236,9 @@ def check_admissions(df: pd.DataFrame) -> List[RuleViolation]:
     if not set(req).issubset(df.columns):
         logging.info("Admissions columns missing; skipping funnel check.")
         return []
-    apps = pd.to_numeric(df[req[0]], errors="coerce")
-    admits = pd.to_numeric(df[req[1]], errors="coerce")
-    enroll = pd.to_numeric(df[req[2]], errors="coerce")
+    apps = as_numeric(df[req[0]])
+    admits = as_numeric(df[req[1]])
+    enroll = as_numeric(df[req[2]])
     violations: List[RuleViolation] = []
     masks = [
         (apps < 0, req[0], "admissions_negative_apps"),
@@ -199,19 +255,16 @@ def check_admissions(df: pd.DataFrame) -> List[RuleViolation]:
     return violations
 
 
-def check_percentages(df: pd.DataFrame) -> List[RuleViolation]:
-    cols = [c for c in df.columns if "_PCT" in c or "_RATE" in c]
-    skip_tokens = ("SAT_", "ACT_", "SAT", "ACT")
+def check_percentages(df: pd.DataFrame, col_classes: ColumnClasses) -> List[RuleViolation]:
     violations: List[RuleViolation] = []
-    skip_cols = [c for c in cols if any(token in c for token in skip_tokens)]
+    skip_cols = col_classes["pct_skip_cols"]
     if skip_cols:
         logging.info(
             "Skipping SAT/ACT percentile columns in percentage check: %s",
             skip_cols,
         )
-    check_cols = [c for c in cols if c not in skip_cols]
-    for col in check_cols:
-        series = pd.to_numeric(df[col], errors="coerce")
+    for col in col_classes["pct_cols"]:
+        series = as_numeric(df[col])
         mask = (series < 0) | (series > 100)
         if mask.any():
             logging.warning("%s has %s percentage violations.", col, mask.sum())
@@ -220,11 +273,11 @@ def check_percentages(df: pd.DataFrame) -> List[RuleViolation]:
     return violations
 
 
-def check_enrollment(df: pd.DataFrame) -> List[RuleViolation]:
-    cols = [c for c in df.columns if c.startswith("ENROLL__") and "HEAD" in c]
+def check_enrollment(df: pd.DataFrame, col_classes: ColumnClasses) -> List[RuleViolation]:
+    cols = col_classes["enroll_cols"]
     violations: List[RuleViolation] = []
     for col in cols:
-        series = pd.to_numeric(df[col], errors="coerce")
+        series = as_numeric(df[col])
         mask = series < 0
         if mask.any():
             logging.warning("%s has %s negative enrollment counts.", col, mask.sum())
@@ -351,24 +404,36 @@ def write_outputs(
         ] + [c for c in cleaned.columns if c.startswith("SFA__NET_PRICE")]
         fh.write("\nSummary statistics:\n")
 
-        def describe(series: pd.Series) -> str:
-            series = pd.to_numeric(series, errors="coerce").dropna()
-            if series.empty:
-                return "No data"
-            stats = series.describe(percentiles=[0.01, 0.5, 0.99])
-            return (
-                f"count={int(stats['count'])}, "
-                f"min={stats['min']:.2f}, "
-                f"p1={stats['1%']:.2f}, "
-                f"median={stats['50%']:.2f}, "
-                f"mean={stats['mean']:.2f}, "
-                f"p99={stats['99%']:.2f}, "
-                f"max={stats['max']:.2f}"
+        # Stack the key columns once so the quantiles are computed in a single
+        # vectorized pass rather than one describe() sort per column.
+        present_cols = [col for col in key_cols if col in cleaned.columns]
+        if present_cols:
+            arr = cleaned[present_cols].apply(as_numeric).to_numpy(
+                dtype=np.float64, na_value=np.nan
             )
-
-        for col in key_cols:
-            if col in cleaned.columns:
-                fh.write(f"{col}: {describe(cleaned[col])}\n")
+            counts = np.count_nonzero(~np.isnan(arr), axis=0)
+            has_data = counts > 0
+            # Reductions need at least one non-missing value per column.
+            data = arr[:, has_data] if has_data.any() else np.full((1, 0), np.nan)
+            quantiles = np.nanquantile(data, [0.01, 0.5, 0.99], axis=0)
+            means = np.nanmean(data, axis=0)
+            mins = np.nanmin(data, axis=0)
+            maxs = np.nanmax(data, axis=0)
+            data_pos = np.cumsum(has_data) - 1
+            for i, col in enumerate(present_cols):
+                if not has_data[i]:
+                    fh.write(f"{col}: No data\n")
+                    continue
+                j = data_pos[i]
+                fh.write(
+                    f"{col}: count={int(counts[i])}, "
+                    f"min={mins[j]:.2f}, "
+                    f"p1={quantiles[0, j]:.2f}, "
+                    f"median={quantiles[1, j]:.2f}, "
+                    f"mean={means[j]:.2f}, "
+                    f"p99={quantiles[2, j]:.2f}, "
+                    f"max={maxs[j]:.2f}\n"
+                )
 
 
 def parse_args() -> argparse.Namespace:
@@ -389,8 +454,8 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def run_checks(df: pd.DataFrame) -> List[RuleViolation]:
-    checks: List[Callable[[pd.DataFrame], List[RuleViolation]]] = [
+def run_checks(df: pd.DataFrame, col_classes: ColumnClasses) -> List[RuleViolation]:
+    checks: List[Callable[[pd.DataFrame, ColumnClasses], List[RuleViolation]]] = [
         check_no_duplicates,
         check_parent_child_status,
         check_net_price,
@@ -402,7 +467,7 @@ def run_checks(df: pd.DataFrame) -> List[RuleViolation]:
     violations: List[RuleViolation] = []
     for check in checks:
         try:
-            violations.extend(check(df))
+            violations.extend(check(df, col_classes))
         except Exception as exc:  # pragma: no cover - defensive
             logging.exception("Validation check %s failed: %s", check.__name__, exc)
     return violations
@@ -421,7 +486,8 @@ def main() -> None:
         logging.error("Failed to load panel: %s", exc)
         sys.exit(1)
 
-    violations = run_checks(df)
+    col_classes = classify_columns(df.columns)
+    violations = run_checks(df, col_classes)
     violations_df = violations_to_dataframe(violations)
     if violations_df.empty:
         violations_df = pd.DataFrame(
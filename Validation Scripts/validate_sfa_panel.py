@@ -3,10 +3,17 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
+import sys
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Sequence
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
 
+import numpy as np
 import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 UNITID_CANDIDATES = ["UNITID", "unitid", "UNIT_ID", "unit_id"]
 YEAR_CANDIDATES = ["YEAR", "year", "SURVEY_YEAR", "survey_year", "panel_year", "SURVYEAR", "survyear"]
@@ -17,42 +24,231 @@ NET_PRICE_BINS = [
     "NET_PRICE_AVG_INC_75_110K",
     "NET_PRICE_AVG_INC_110K_PLUS",
 ]
+NESTED_COUNT_COLUMNS = [
+    "SFA_FTFT_N",
+    "SFA_FTFT_N_AID",
+    "SFA_FTFT_N_PELL",
+    "SFA_FTFT_N_FED_LOAN",
+]
+PLOTS = [
+    ("SFA_FTFT_AVG_PELL_AMT", "sfa_ftft_avg_pell_amt_by_year.png"),
+    ("NET_PRICE_AVG_TITLEIV", "net_price_avg_titleiv_by_year.png"),
+    ("SFA_FTFT_PCT_PELL", "sfa_ftft_pct_pell_by_year.png"),
+]
 SFA_LONG_DIR = Path("/Users/markjaysonfarol13/Higher Ed research/IPEDS/Parquets/Unify/SFAlong")
 SFA_WIDE_DIR = Path("/Users/markjaysonfarol13/Higher Ed research/IPEDS/Parquets/Unify/SFAwide")
 VALIDATION_DIR = Path("/Users/markjaysonfarol13/Higher Ed research/IPEDS/Parquets/Validation")
 
-
-def resolve_column(df: pd.DataFrame, preferred: str, fallbacks: Sequence[str]) -> str:
+NumericCache = Mapping[str, np.ndarray]
+STATS_PHYSICAL_TYPES = {"INT32", "INT64", "FLOAT", "DOUBLE"}
+STATS_LOGICAL_TYPES = {"NONE", "INT"}
+
+
+@dataclass(frozen=True)
+class ColumnStats:
+    """Footer statistics for one numeric parquet column, folded across row groups."""
+
+    num_rows: int
+    null_count: int
+    min: float | None
+    max: float | None
+
+    @property
+    def all_null(self) -> bool:
+        return self.null_count >= self.num_rows
+
+    def within(self, low: float, high: float) -> bool:
+        return self.min is not None and self.max is not None and low <= self.min and self.max <= high
+
+
+def parquet_column_stats(metadata: pq.FileMetaData) -> Dict[str, ColumnStats]:
+    """Fold row-group min/max/null_count for plain numeric columns from a parquet footer.
+
+    Columns whose statistics are missing in any row group, or whose stored values
+    are not plain ints/floats (e.g. decimals, strings), are left out.
+    """
+    folded: Dict[str, ColumnStats] = {}
+    usable: Dict[str, bool] = {}
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        for ci in range(row_group.num_columns):
+            chunk = row_group.column(ci)
+            name = chunk.path_in_schema
+            stats = chunk.statistics
+            ok = (
+                usable.get(name, True)
+                and stats is not None
+                and stats.has_null_count
+                and chunk.physical_type in STATS_PHYSICAL_TYPES
+                and stats.logical_type.type in STATS_LOGICAL_TYPES
+            )
+            usable[name] = ok
+            if not ok:
+                continue
+            low = stats.min if stats.has_min_max else None
+            high = stats.max if stats.has_min_max else None
+            previous = folded.get(name)
+            if previous is not None and previous.min is not None:
+                low = previous.min if low is None else min(low, previous.min)
+            if previous is not None and previous.max is not None:
+                high = previous.max if high is None else max(high, previous.max)
+            folded[name] = ColumnStats(
+                num_rows=row_group.num_rows + (previous.num_rows if previous else 0),
+                null_count=stats.null_count + (previous.null_count if previous else 0),
+                min=low,
+                max=high,
+            )
+    return {name: stats for name, stats in folded.items() if usable[name]}
+
+
+def resolve_column(columns: Iterable[str], preferred: str, fallbacks: Sequence[str]) -> str:
+    available = set(columns)
     candidates = [preferred, *fallbacks]
     for candidate in candidates:
-        if candidate in df.columns:
+        if candidate in available:
             return candidate
     raise KeyError(f"None of the requested columns are present: {candidates}")
 
 
+def column_upper_map(columns: Iterable[str]) -> Dict[str, str]:
+    """Upper-case each column name once so the checks can share the lookups."""
+    return {col: col.upper() for col in columns}
+
+
+def needed_sfa_columns(names: Sequence[str], unitid_col: str, year_col: str) -> List[str]:
+    """Return the SFA panel columns touched by the checks, in schema order."""
+    keep = {unitid_col, year_col, *NET_PRICE_BINS, *NESTED_COUNT_COLUMNS}
+    keep.update(column for column, _ in PLOTS)
+    selected: List[str] = []
+    for name, upper in column_upper_map(names).items():
+        if (
+            name in keep
+            or "_PCT_" in upper
+            or upper.endswith("_AMT")
+            or upper.startswith("NET_PRICE_")
+            or (upper.startswith("SFA_") and "_N" in upper)
+        ):
+            selected.append(name)
+    return selected
+
+
 def to_numeric(series: pd.Series) -> pd.Series:
     return pd.to_numeric(series, errors="coerce")
 
 
+class LazyNumericCache(Mapping[str, np.ndarray]):
+    """Coerce a column to float64 (NaN for missing) on first use and share the array afterwards.
+
+    Columns that footer statistics already settle are never looked up, so they are never converted.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Iterable[str]) -> None:
+        self._df = df
+        self._columns = list(columns)
+        self._allowed = set(self._columns)
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        array = self._arrays.get(column)
+        if array is None:
+            if column not in self._allowed:
+                raise KeyError(column)
+            array = to_numeric(self._df[column]).to_numpy(dtype=np.float64, na_value=np.nan)
+            self._arrays[column] = array
+        return array
+
+    def __contains__(self, column: object) -> bool:
+        return column in self._allowed
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+
+def build_numeric_cache(df: pd.DataFrame, columns: Iterable[str]) -> LazyNumericCache:
+    """Return a shared numeric view of ``columns``; each column is converted only when a check reads it."""
+    return LazyNumericCache(df, columns)
+
+
+def numeric_values(df: pd.DataFrame, column: str, numeric: NumericCache | None = None) -> np.ndarray:
+    if numeric is not None and column in numeric:
+        return numeric[column]
+    return to_numeric(df[column]).to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def numeric_block(df: pd.DataFrame, columns: Sequence[str], numeric: NumericCache | None = None) -> np.ndarray:
+    """Stack ``columns`` into a single (rows, columns) float64 array with NaN for missing."""
+    if numeric is None:
+        return df[list(columns)].apply(to_numeric).to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.column_stack([numeric_values(df, col, numeric) for col in columns])
+
+
+def count_true(ufunc: np.ufunc, scratch: np.ndarray, *operands: object) -> np.ndarray:
+    """Evaluate a predicate ufunc into a reused bool buffer and count hits along axis 0.
+
+    Writing every comparison into the same scratch buffer keeps the scans from
+    allocating a fresh temporary per predicate per column.
+    """
+    ufunc(*operands, out=scratch)
+    return np.count_nonzero(scratch, axis=0)
+
+
 def write_violation_parquet(rows: pd.DataFrame, parquet_dir: Path | None, filename: str) -> Path | None:
     if parquet_dir is None or rows.empty:
         return None
     parquet_dir.mkdir(parents=True, exist_ok=True)
     destination = parquet_dir / filename
-    rows.to_parquet(destination, index=False)
+    # Violation frames are small and repetitive (UNITID/YEAR keys), so zstd with
+    # dictionary encoding and row groups capped at 64k rows keeps them compact and quick to write.
+    rows.to_parquet(
+        destination,
+        index=False,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+        row_group_size=min(len(rows), 65536),
+    )
     return destination
 
 
-def check_percent_bounds(df: pd.DataFrame) -> List[str]:
+def check_percent_bounds(
+    df: pd.DataFrame,
+    numeric: NumericCache | None = None,
+    stats: Mapping[str, ColumnStats] | None = None,
+    upper_map: Mapping[str, str] | None = None,
+) -> List[str]:
     lines: List[str] = []
-    percent_cols = [col for col in df.columns if "_PCT_" in col.upper()]
+    upper_map = upper_map or column_upper_map(df.columns)
+    percent_cols = [col for col in df.columns if "_PCT_" in upper_map[col]]
+    stats = stats or {}
+    # Footer statistics settle all-null and fully in-range columns without a scan.
+    in_range = {col for col in percent_cols if col in stats and stats[col].within(0, 100)}
+    scan_cols = [
+        col for col in percent_cols if col not in in_range and not (col in stats and stats[col].all_null)
+    ]
+    scan_pos = {col: i for i, col in enumerate(scan_cols)}
+    if scan_cols:
+        values = numeric_block(df, scan_cols, numeric)
+        scratch = np.empty(values.shape, dtype=bool)
+        nonmissing_counts = values.shape[0] - count_true(np.isnan, scratch, values)
+        # NaN compares False, so the bound counts already skip missing cells.
+        lt_zero_counts = count_true(np.less, scratch, values, 0)
+        gt_hundred_counts = count_true(np.greater, scratch, values, 100)
     for col in percent_cols:
-        values = to_numeric(df[col])
-        nonmissing = values.notna().sum()
+        if col in in_range:
+            lines.append(f"{col}: 0 (<0) {0:.2%}; 0 (>100) {0:.2%}")
+            continue
+        if col not in scan_pos:
+            continue
+        i = scan_pos[col]
+        nonmissing = nonmissing_counts[i]
         if nonmissing == 0:
             continue
-        lt_zero = (values < 0).sum()
-        gt_hundred = (values > 100).sum()
+        lt_zero = lt_zero_counts[i]
+        gt_hundred = gt_hundred_counts[i]
         lines.append(
             f"{col}: {lt_zero} (<0) {lt_zero / nonmissing:.2%}; {gt_hundred} (>100) {gt_hundred / nonmissing:.2%}"
         )
@@ -61,60 +257,94 @@ def check_percent_bounds(df: pd.DataFrame) -> List[str]:
     return lines
 
 
-def summarize_series(series: pd.Series) -> str:
-    clean = series.dropna()
-    if clean.empty:
+def summarize_series(values: pd.Series | np.ndarray) -> str:
+    arr = np.asarray(values, dtype=np.float64)
+    arr = arr[~np.isnan(arr)]
+    if arr.size == 0:
         return "insufficient data"
-    stats = clean.describe(percentiles=[0.01, 0.5, 0.99])
+    # One partition pass for the order statistics plus a mean; describe() also paid for std.
+    mn, p1, p50, p99, mx = np.quantile(arr, [0.0, 0.01, 0.5, 0.99, 1.0])
     return (
-        f"min={stats['min']:.2f}, p1={stats['1%']:.2f}, median={stats['50%']:.2f}, "
-        f"mean={stats['mean']:.2f}, p99={stats['99%']:.2f}, max={stats['max']:.2f}"
+        f"min={mn:.2f}, p1={p1:.2f}, median={p50:.2f}, "
+        f"mean={arr.mean():.2f}, p99={p99:.2f}, max={mx:.2f}"
     )
 
 
-def check_amount_bounds(df: pd.DataFrame) -> List[str]:
-    lines: List[str] = []
-    candidates = [col for col in df.columns if col.upper().endswith("_AMT") or col.upper().startswith("NET_PRICE_")]
-    for col in candidates:
-        values = to_numeric(df[col])
-        nonmissing = values.notna().sum()
-        if nonmissing == 0:
-            continue
-        neg = (values < 0).sum()
-        neg_large = (values < -1000).sum()
-        stats_line = summarize_series(values.dropna()) if nonmissing else ""
-        is_net_price = col.upper().startswith("NET_PRICE_")
-        warning = ""
-        if not is_net_price and neg > 0:
-            warning = " [WARNING: negative values in amount column]"
-        lines.append(
-            f"{col}: negatives={neg} ({neg / nonmissing:.2%}), < -1000={neg_large} ({neg_large / nonmissing:.2%}); {stats_line}{warning}"
-        )
+def _amount_line(col: str, column: np.ndarray, is_net_price: bool) -> Optional[str]:
+    # Drop missing cells once; counts and stats all read the same present values.
+    present = column[~np.isnan(column)]
+    nonmissing = present.size
+    if nonmissing == 0:
+        return None
+    neg = np.count_nonzero(present < 0)
+    neg_large = np.count_nonzero(present < -1000)
+    stats_line = summarize_series(present)
+    warning = ""
+    if not is_net_price and neg > 0:
+        warning = " [WARNING: negative values in amount column]"
+    return (
+        f"{col}: negatives={neg} ({neg / nonmissing:.2%}), < -1000={neg_large} ({neg_large / nonmissing:.2%}); {stats_line}{warning}"
+    )
+
+
+def check_amount_bounds(
+    df: pd.DataFrame,
+    numeric: NumericCache | None = None,
+    executor: Executor | None = None,
+    upper_map: Mapping[str, str] | None = None,
+) -> List[str]:
+    upper_map = upper_map or column_upper_map(df.columns)
+    candidates = [
+        col for col in df.columns if upper_map[col].endswith("_AMT") or upper_map[col].startswith("NET_PRICE_")
+    ]
+    net_price_flags = [upper_map[col].startswith("NET_PRICE_") for col in candidates]
+    block = numeric_block(df, candidates, numeric) if candidates else None
+    columns = [block[:, i] for i in range(len(candidates))]
+    # Columns are independent and the NumPy work releases the GIL, so a thread pool scales here.
+    results = (executor.map if executor is not None else map)(_amount_line, candidates, columns, net_price_flags)
+    lines: List[str] = [line for line in results if line is not None]
     if not lines:
         lines.append("No amount/net price columns found.")
     return lines
 
 
-def check_negative_counts(df: pd.DataFrame) -> List[str]:
+def _negative_count_line(col: str, values: np.ndarray) -> Optional[str]:
+    scratch = np.empty(values.shape, dtype=bool)
+    nonmissing = values.size - count_true(np.isnan, scratch, values)
+    if nonmissing == 0:
+        return None
+    neg = count_true(np.less, scratch, values, 0)
+    if not neg:
+        return None
+    return f"{col}: {neg} negative values ({neg / nonmissing:.2%} of nonmissing)."
+
+
+def check_negative_counts(
+    df: pd.DataFrame,
+    numeric: NumericCache | None = None,
+    stats: Mapping[str, ColumnStats] | None = None,
+    executor: Executor | None = None,
+    upper_map: Mapping[str, str] | None = None,
+) -> List[str]:
     """Check for negative values in SFA count-style columns."""
 
     lines: List[str] = []
-    count_cols = [col for col in df.columns if col.upper().startswith("SFA_") and "_N" in col.upper()]
+    upper_map = upper_map or column_upper_map(df.columns)
+    count_cols = [col for col in df.columns if upper_map[col].startswith("SFA_") and "_N" in upper_map[col]]
     if not count_cols:
         lines.append("No SFA *_N count columns detected for negative-value check.")
         return lines
 
-    any_neg = False
+    scan_cols = []
     for col in count_cols:
-        values = to_numeric(df[col])
-        nonmissing = values.notna().sum()
-        if nonmissing == 0:
+        col_stats = stats.get(col) if stats else None
+        if col_stats is not None and (col_stats.all_null or col_stats.within(0, np.inf)):
             continue
-        neg = (values < 0).sum()
-        if neg:
-            any_neg = True
-            lines.append(f"{col}: {neg} negative values ({neg / nonmissing:.2%} of nonmissing).")
-    if not any_neg:
+        scan_cols.append(col)
+    arrays = [numeric_values(df, col, numeric) for col in scan_cols]
+    results = (executor.map if executor is not None else map)(_negative_count_line, scan_cols, arrays)
+    lines.extend(line for line in results if line is not None)
+    if not lines:
         lines.append("No negative values found in SFA *_N count columns.")
     return lines
 
@@ -124,15 +354,10 @@ def check_nested_counts(
     unitid_col: str,
     year_col: str,
     parquet_dir: Path | None = None,
+    numeric: NumericCache | None = None,
 ) -> List[str]:
     lines: List[str] = []
-    required = [
-        "SFA_FTFT_N",
-        "SFA_FTFT_N_AID",
-        "SFA_FTFT_N_PELL",
-        "SFA_FTFT_N_FED_LOAN",
-    ]
-    missing = [col for col in required if col not in df.columns]
+    missing = [col for col in NESTED_COUNT_COLUMNS if col not in df.columns]
     if missing:
         lines.append(f"Skipping nested-count check; missing columns: {', '.join(missing)}")
         return lines
@@ -142,25 +367,31 @@ def check_nested_counts(
         ("SFA_FTFT_N_PELL", "<=", "SFA_FTFT_N_AID"),
         ("SFA_FTFT_N_FED_LOAN", "<=", "SFA_FTFT_N_AID"),
     ]
+    # One contiguous (rows, 4) block and NaN mask shared by all three comparisons.
+    counts = np.ascontiguousarray(numeric_block(df, NESTED_COUNT_COLUMNS, numeric))
+    missing_mask = np.isnan(counts)
+    position = {col: i for i, col in enumerate(NESTED_COUNT_COLUMNS)}
     for left, _, right in checks:
-        left_vals = to_numeric(df[left])
-        right_vals = to_numeric(df[right])
-        mask = left_vals.notna() & right_vals.notna()
+        li, ri = position[left], position[right]
+        mask = ~(missing_mask[:, li] | missing_mask[:, ri])
         if not mask.any():
             continue
-        violations = (left_vals > right_vals) & mask
-        count = violations.sum()
-        share = count / mask.sum()
+        violations = counts[:, li] > counts[:, ri]
+        count = np.count_nonzero(violations)
+        share = count / np.count_nonzero(mask)
         lines.append(f"{left} <= {right}: {count} violations ({share:.2%} of comparable rows)")
         if count:
-            sample = df.loc[violations, [unitid_col, year_col, left, right]].head(5)
+            columns = [unitid_col, year_col, left, right]
+            violation_idx = np.flatnonzero(violations)
+            sample = df.iloc[violation_idx[:5]][columns]
             lines.append(f"Sample violations for {left} <= {right}:")
             lines.append(sample.to_string(index=False))
-            violation_rows = df.loc[violations, [unitid_col, year_col, left, right]].copy()
-            filename = f"{left.lower()}_gt_{right.lower()}.parquet"
-            dest = write_violation_parquet(violation_rows, parquet_dir, filename)
-            if dest:
-                lines.append(f"Saved {count} violations to {dest}")
+            if parquet_dir is not None:
+                violation_rows = df.iloc[violation_idx][columns]
+                filename = f"{left.lower()}_gt_{right.lower()}.parquet"
+                dest = write_violation_parquet(violation_rows, parquet_dir, filename)
+                if dest:
+                    lines.append(f"Saved {count} violations to {dest}")
     return lines
 
 
@@ -173,6 +404,7 @@ def check_cross_component(
     ef_year_col: str,
     ef_ftft_col: str,
     parquet_dir: Path | None = None,
+    numeric: NumericCache | None = None,
 ) -> List[str]:
     lines: List[str] = []
     if "SFA_FTFT_N" not in sfa_df.columns:
@@ -181,12 +413,74 @@ def check_cross_component(
     if ef_ftft_col not in ef_df.columns:
         lines.append(f"EF panel missing {ef_ftft_col}; skipping cross-component check.")
         return lines
+    sfa_present = sfa_df["SFA_FTFT_N"].notna().to_numpy()
+    # Both selections are already new frames and are only read below, so no defensive copies.
+    sfa_tmp = sfa_df.loc[sfa_present, [unitid_col, year_col, "SFA_FTFT_N"]]
+    ef_tmp = ef_df[[ef_unitid_col, ef_year_col, ef_ftft_col]].dropna(subset=[ef_ftft_col])
+    sfa_keys = pd.MultiIndex.from_arrays([sfa_tmp[unitid_col], sfa_tmp[year_col]])
+    ef_keys = pd.MultiIndex.from_arrays([ef_tmp[ef_unitid_col], ef_tmp[ef_year_col]])
+    if not ef_keys.is_unique:
+        # Duplicate EF keys fan out into several merged rows; keep the general merge for that case.
+        return _check_cross_component_merge(
+            sfa_tmp, ef_tmp, unitid_col, year_col, ef_unitid_col, ef_year_col, ef_ftft_col, parquet_dir
+        )
+
+    # Hash-join: position of each SFA (unitid, year) in the unique EF key index.
+    ef_pos = ef_keys.get_indexer(sfa_keys)
+    sfa_rows = np.flatnonzero(ef_pos >= 0)
+    if sfa_rows.size == 0:
+        msg = "No overlapping UNITID/YEAR between SFA and EF panels."
+        lines.append(msg)
+        logging.warning(msg)
+        return lines
+    ef_rows = ef_pos[sfa_rows]
+    sfa_counts = numeric_values(sfa_df, "SFA_FTFT_N", numeric)[sfa_present][sfa_rows]
+    ef_counts = to_numeric(ef_tmp[ef_ftft_col]).to_numpy(dtype=np.float64, na_value=np.nan)[ef_rows]
+    mask = ~(np.isnan(sfa_counts) | np.isnan(ef_counts))
+    if not mask.any():
+        msg = f"No comparable SFA_FTFT_N/{ef_ftft_col} rows between SFA and EF panels."
+        lines.append(msg)
+        logging.warning(msg)
+        return lines
+    violations = sfa_counts > ef_counts
+    count = np.count_nonzero(violations)
+    share = count / np.count_nonzero(mask)
+    lines.append(f"SFA_FTFT_N <= {ef_ftft_col}: {count} violations ({share:.2%})")
+    if count:
+        violation_idx = np.flatnonzero(violations)
+        if parquet_dir is None:
+            # Only the sample is printed, so gather just its rows.
+            violation_idx = violation_idx[:5]
+        violation_rows = pd.concat(
+            [
+                sfa_tmp.iloc[sfa_rows[violation_idx]]
+                .set_axis(["sfa_unitid", "sfa_year", "SFA_FTFT_N"], axis=1)
+                .reset_index(drop=True),
+                ef_tmp[[ef_ftft_col]].iloc[ef_rows[violation_idx]].reset_index(drop=True),
+            ],
+            axis=1,
+        )
+        lines.extend(_report_cross_component(violation_rows, count, ef_ftft_col, parquet_dir))
+    return lines
+
+
+def _check_cross_component_merge(
+    sfa_tmp: pd.DataFrame,
+    ef_tmp: pd.DataFrame,
+    unitid_col: str,
+    year_col: str,
+    ef_unitid_col: str,
+    ef_year_col: str,
+    ef_ftft_col: str,
+    parquet_dir: Path | None,
+) -> List[str]:
+    lines: List[str] = []
     merge_cols = {unitid_col: "sfa_unitid", year_col: "sfa_year"}
-    sfa_tmp = sfa_df[[unitid_col, year_col, "SFA_FTFT_N"]].dropna(subset=["SFA_FTFT_N"]).copy()
-    ef_tmp = ef_df[[ef_unitid_col, ef_year_col, ef_ftft_col]].dropna(subset=[ef_ftft_col]).copy()
-    sfa_tmp.rename(columns=merge_cols, inplace=True)
-    ef_tmp.rename(columns={ef_unitid_col: "sfa_unitid", ef_year_col: "sfa_year"}, inplace=True)
-    merged = sfa_tmp.merge(ef_tmp, on=["sfa_unitid", "sfa_year"], how="inner")
+    merged = sfa_tmp.rename(columns=merge_cols).merge(
+        ef_tmp.rename(columns={ef_unitid_col: "sfa_unitid", ef_year_col: "sfa_year"}),
+        on=["sfa_unitid", "sfa_year"],
+        how="inner",
+    )
     if merged.empty:
         msg = "No overlapping UNITID/YEAR between SFA and EF panels."
         lines.append(msg)
@@ -195,19 +489,29 @@ def check_cross_component(
     sfa_counts = to_numeric(merged["SFA_FTFT_N"])
     ef_counts = to_numeric(merged[ef_ftft_col])
     mask = sfa_counts.notna() & ef_counts.notna()
+    if not mask.any():
+        msg = f"No comparable SFA_FTFT_N/{ef_ftft_col} rows between SFA and EF panels."
+        lines.append(msg)
+        logging.warning(msg)
+        return lines
     violations = (sfa_counts > ef_counts) & mask
     count = violations.sum()
     share = count / mask.sum()
     lines.append(f"SFA_FTFT_N <= {ef_ftft_col}: {count} violations ({share:.2%})")
     if count:
-        sample = merged.loc[violations, ["sfa_unitid", "sfa_year", "SFA_FTFT_N", ef_ftft_col]].head(5)
-        lines.append("Sample cross-component violations:")
-        lines.append(sample.to_string(index=False))
-        violation_rows = merged.loc[violations, ["sfa_unitid", "sfa_year", "SFA_FTFT_N", ef_ftft_col]].copy()
-        filename = f"sfa_ftft_n_gt_{ef_ftft_col.lower()}.parquet"
-        dest = write_violation_parquet(violation_rows, parquet_dir, filename)
-        if dest:
-            lines.append(f"Saved {count} cross-component violations to {dest}")
+        violation_rows = merged.loc[violations, ["sfa_unitid", "sfa_year", "SFA_FTFT_N", ef_ftft_col]]
+        lines.extend(_report_cross_component(violation_rows, count, ef_ftft_col, parquet_dir))
+    return lines
+
+
+def _report_cross_component(
+    violation_rows: pd.DataFrame, count: int, ef_ftft_col: str, parquet_dir: Path | None
+) -> List[str]:
+    lines = ["Sample cross-component violations:", violation_rows.head(5).to_string(index=False)]
+    filename = f"sfa_ftft_n_gt_{ef_ftft_col.lower()}.parquet"
+    dest = write_violation_parquet(violation_rows, parquet_dir, filename)
+    if dest:
+        lines.append(f"Saved {count} cross-component violations to {dest}")
     return lines
 
 
@@ -216,6 +520,7 @@ def check_net_price_monotonicity(
     unitid_col: str,
     year_col: str,
     parquet_dir: Path | None = None,
+    numeric: NumericCache | None = None,
 ) -> List[str]:
     lines: List[str] = []
     low_col = "NET_PRICE_AVG_INC_0_30K"
@@ -223,19 +528,20 @@ def check_net_price_monotonicity(
     if low_col not in df.columns or high_col not in df.columns:
         lines.append("0-30K and 110K+ net price bins not both present; skipping monotonicity check.")
         return lines
-    subset = df[[unitid_col, year_col, low_col, high_col]].dropna()
-    if subset.empty:
+    columns = [unitid_col, year_col, low_col, high_col]
+    complete = np.flatnonzero(df[columns].notna().all(axis=1).to_numpy())
+    if complete.size == 0:
         lines.append("No rows have both low- and high-income net price bins.")
         return lines
-    low = to_numeric(subset[low_col])
-    high = to_numeric(subset[high_col])
+    low = numeric_values(df, low_col, numeric)[complete]
+    high = numeric_values(df, high_col, numeric)[complete]
     violations_mask = low > high
-    count = int(violations_mask.sum())
-    total = len(subset)
+    count = int(np.count_nonzero(violations_mask))
+    total = complete.size
     share = count / total if total else 0.0
     lines.append(f"{low_col} <= {high_col}: {count} violations ({share:.2%} of complete rows)")
     if count:
-        violation_rows = subset.loc[violations_mask].copy()
+        violation_rows = df.iloc[complete[violations_mask]][columns].copy()
         dest = write_violation_parquet(violation_rows, parquet_dir, "net_price_monotonicity_violations.parquet")
         if dest:
             lines.append(f"Wrote {count} net price monotonicity violations to {dest}")
@@ -246,31 +552,31 @@ def plot_time_series(df: pd.DataFrame, year_col: str, output_dir: Path) -> List[
     import matplotlib.pyplot as plt
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    plots = [
-        ("SFA_FTFT_AVG_PELL_AMT", "sfa_ftft_avg_pell_amt_by_year.png"),
-        ("NET_PRICE_AVG_TITLEIV", "net_price_avg_titleiv_by_year.png"),
-        ("SFA_FTFT_PCT_PELL", "sfa_ftft_pct_pell_by_year.png"),
-    ]
     lines: List[str] = []
-    for column, filename in plots:
-        if column not in df.columns:
-            lines.append(f"Skipping plot for {column}; column missing.")
-            continue
-        series = df[[year_col, column]].dropna()
-        if series.empty:
-            lines.append(f"Skipping plot for {column}; no data.")
-            continue
-        grouped = series.groupby(year_col)[column].mean()
-        fig, ax = plt.subplots(figsize=(8, 4))
-        grouped.plot(ax=ax)
-        ax.set_title(column)
-        ax.set_xlabel("Year")
-        ax.set_ylabel(column)
-        fig.tight_layout()
-        dest = output_dir / filename
-        fig.savefig(dest)
+    present = [column for column, _ in PLOTS if column in df.columns]
+    # One groupby over every plotted column; mean() already skips missing values.
+    yearly_means = df[[year_col, *present]].groupby(year_col).mean() if present else pd.DataFrame()
+    fig, ax = plt.subplots(figsize=(8, 4))
+    try:
+        for column, filename in PLOTS:
+            if column not in df.columns:
+                lines.append(f"Skipping plot for {column}; column missing.")
+                continue
+            grouped = yearly_means[column].dropna()
+            if grouped.empty:
+                lines.append(f"Skipping plot for {column}; no data.")
+                continue
+            ax.clear()
+            grouped.plot(ax=ax)
+            ax.set_title(column)
+            ax.set_xlabel("Year")
+            ax.set_ylabel(column)
+            fig.tight_layout()
+            dest = output_dir / filename
+            fig.savefig(dest)
+            lines.append(f"Saved {dest}")
+    finally:
         plt.close(fig)
-        lines.append(f"Saved {dest}")
     return lines
 
 
@@ -319,31 +625,43 @@ def main() -> None:
         raise FileNotFoundError(f"SFA panel not found: {args.sfa_panel}")
 
     logging.info("Loading SFA panel: %s", args.sfa_panel)
-    sfa_df = pd.read_parquet(args.sfa_panel)
+    # dataset() also accepts partitioned/directory panels; footer stats only exist for one file.
+    sfa_names = ds.dataset(args.sfa_panel, format="parquet", partitioning="hive").schema.names
+    sfa_stats: Dict[str, ColumnStats] = {}
+    if args.sfa_panel.is_file():
+        with pq.ParquetFile(args.sfa_panel) as sfa_file:
+            sfa_stats = parquet_column_stats(sfa_file.metadata)
     try:
-        unitid_col = resolve_column(sfa_df, args.unitid_col, UNITID_CANDIDATES)
-        year_col = resolve_column(sfa_df, args.year_col, YEAR_CANDIDATES)
+        unitid_col = resolve_column(sfa_names, args.unitid_col, UNITID_CANDIDATES)
+        year_col = resolve_column(sfa_names, args.year_col, YEAR_CANDIDATES)
     except KeyError as exc:
         raise KeyError("Unable to find UNITID/YEAR columns in SFA panel") from exc
+    sfa_columns = needed_sfa_columns(sfa_names, unitid_col, year_col)
+    logging.info("Reading %s of %s SFA panel columns", len(sfa_columns), len(sfa_names))
+    sfa_df = pd.read_parquet(args.sfa_panel, columns=sfa_columns, engine="pyarrow")
+
+    numeric = build_numeric_cache(sfa_df, [col for col in sfa_df.columns if col not in (unitid_col, year_col)])
 
     summary_lines: List[str] = []
 
-    percent_lines = check_percent_bounds(sfa_df)
+    upper_map = column_upper_map(sfa_df.columns)
+    percent_lines = check_percent_bounds(sfa_df, numeric, sfa_stats, upper_map)
     logging.info("Percent bound checks complete")
     summary_lines.append("Percent bounds:")
     summary_lines.extend(percent_lines)
 
-    amount_lines = check_amount_bounds(sfa_df)
-    logging.info("Amount/net price checks complete")
-    summary_lines.append("Amount & net price bounds:")
-    summary_lines.extend(amount_lines)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        amount_lines = check_amount_bounds(sfa_df, numeric, executor, upper_map)
+        logging.info("Amount/net price checks complete")
+        summary_lines.append("Amount & net price bounds:")
+        summary_lines.extend(amount_lines)
 
-    neg_count_lines = check_negative_counts(sfa_df)
-    logging.info("Negative count checks complete")
-    summary_lines.append("Negative count checks:")
-    summary_lines.extend(neg_count_lines)
+        neg_count_lines = check_negative_counts(sfa_df, numeric, sfa_stats, executor, upper_map)
+        logging.info("Negative count checks complete")
+        summary_lines.append("Negative count checks:")
+        summary_lines.extend(neg_count_lines)
 
-    nested_lines = check_nested_counts(sfa_df, unitid_col, year_col, args.parquet_dir)
+    nested_lines = check_nested_counts(sfa_df, unitid_col, year_col, args.parquet_dir, numeric)
     logging.info("Nested FTFT checks complete")
     summary_lines.append("Nested FTFT cohort checks:")
     summary_lines.extend(nested_lines)
@@ -352,21 +670,28 @@ def main() -> None:
         if not Path(args.ef_panel).exists():
             raise FileNotFoundError(f"EF panel not found: {args.ef_panel}")
         logging.info("Loading EF panel: %s", args.ef_panel)
-        ef_df = pd.read_parquet(args.ef_panel)
+        ef_names = ds.dataset(args.ef_panel, format="parquet", partitioning="hive").schema.names
+        ef_unitid_col = resolve_column(ef_names, args.ef_unitid_col, UNITID_CANDIDATES)
+        ef_year_col = resolve_column(ef_names, args.ef_year_col, YEAR_CANDIDATES)
+        ef_columns = [ef_unitid_col, ef_year_col]
+        if args.ef_ftft_col in ef_names:
+            ef_columns.append(args.ef_ftft_col)
+        ef_df = pd.read_parquet(args.ef_panel, columns=ef_columns, engine="pyarrow")
         cross_lines = check_cross_component(
             sfa_df,
             ef_df,
             unitid_col,
             year_col,
-            resolve_column(ef_df, args.ef_unitid_col, UNITID_CANDIDATES),
-            resolve_column(ef_df, args.ef_year_col, YEAR_CANDIDATES),
+            ef_unitid_col,
+            ef_year_col,
             args.ef_ftft_col,
             args.parquet_dir,
+            numeric,
         )
         summary_lines.append("Cross-component EF checks:")
         summary_lines.extend(cross_lines)
 
-    monotonic_lines = check_net_price_monotonicity(sfa_df, unitid_col, year_col, args.parquet_dir)
+    monotonic_lines = check_net_price_monotonicity(sfa_df, unitid_col, year_col, args.parquet_dir, numeric)
     logging.info("Net price monotonicity checks complete")
     summary_lines.append("Net price monotonicity:")
     summary_lines.extend(monotonic_lines)
@@ -376,11 +701,13 @@ def main() -> None:
         summary_lines.append("Plots:")
         summary_lines.extend(plot_lines)
 
-    text = "\n".join(summary_lines)
-    print(text)
+    sys.stdout.writelines(f"{line}\n" for line in summary_lines)
     if not args.no_output_summary and args.output_summary:
         args.output_summary.parent.mkdir(parents=True, exist_ok=True)
-        args.output_summary.write_text(text)
+        with args.output_summary.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+            for line in summary_lines:
+                fh.write(line)
+                fh.write("\n")
         logging.info("Saved summary to %s", args.output_summary)
     elif args.no_output_summary:
         logging.info("Summary file skipped per CLI flag.")